@@ -0,0 +1,80 @@
+"""Compare full decoding with the draft/thumbnail image pipeline.
+
+The sample set is generated deterministically on each run (camera-sized
+JPEGs plus a PNG and a WebP) so no binary fixtures live in the repo.
+
+Run from the repository root:  python -m benchmarks.bench_images
+"""
+import io
+import time
+
+from PIL import Image, ImageDraw, ImageFilter
+
+from voyagemind.image_pipeline import TARGET_SIZE, downscale
+
+ROUNDS = 5
+SAMPLES = [
+    ("photo_12mp.jpg", "JPEG", (4000, 3000)),
+    ("photo_24mp.jpg", "JPEG", (6000, 4000)),
+    ("photo_4mp.jpg", "JPEG", (2400, 1600)),
+    ("poster.png", "PNG", (2000, 1500)),
+    ("banner.webp", "WEBP", (3000, 1200)),
+]
+
+
+def make_sample(fmt, size):
+    """A photo-like image: gradients plus shapes, blurred so JPEG compresses realistically"""
+    small = Image.linear_gradient("L").resize((size[0] // 8, size[1] // 8))
+    img = Image.merge("RGB", (small, small.transpose(Image.Transpose.FLIP_LEFT_RIGHT), small.rotate(90, expand=False)))
+    draw = ImageDraw.Draw(img)
+    for i in range(0, img.width, max(1, img.width // 12)):
+        draw.ellipse((i, i % img.height, i + img.width // 10, i % img.height + img.height // 6), fill=(i % 255, 120, 200))
+    img = img.resize(size, Image.Resampling.BILINEAR).filter(ImageFilter.GaussianBlur(2))
+    out = io.BytesIO()
+    img.save(out, fmt, quality=90) if fmt != "PNG" else img.save(out, fmt)
+    return out.getvalue()
+
+
+def legacy(data):
+    """What get_location_images used to do: decode the original at full size"""
+    img = Image.open(io.BytesIO(data)).convert("RGB")
+    img.thumbnail(TARGET_SIZE)
+    out = io.BytesIO()
+    img.save(out, "JPEG", quality=80)
+    return out.getvalue()
+
+
+def decoded_bytes(data, draft):
+    """Size of the pixel buffer each approach has to hold while decoding"""
+    with Image.open(io.BytesIO(data)) as img:
+        if draft:
+            img.draft("RGB", TARGET_SIZE)
+        return img.width * img.height * len(img.getbands())
+
+
+def measure(fn, data):
+    best = float("inf")
+    for _ in range(ROUNDS):
+        started = time.perf_counter()
+        out = fn(data)
+        best = min(best, time.perf_counter() - started)
+    return best * 1000, len(out)
+
+
+def main():
+    print(f"{'sample':<16} {'input KB':>9} {'full ms':>8} {'new ms':>7} {'full MB':>8} {'new MB':>7} {'out KB':>7}")
+    totals = [0.0, 0.0, 0, 0]
+    for name, fmt, size in SAMPLES:
+        data = make_sample(fmt, size)
+        old_ms, _ = measure(legacy, data)
+        new_ms, out_bytes = measure(downscale, data)
+        old_decoded, new_decoded = decoded_bytes(data, False), decoded_bytes(data, True)
+        totals = [totals[0] + old_ms, totals[1] + new_ms, totals[2] + old_decoded, totals[3] + new_decoded]
+        print(f"{name:<16} {len(data) / 1024:>9.0f} {old_ms:>8.1f} {new_ms:>7.1f} "
+              f"{old_decoded / 2**20:>8.1f} {new_decoded / 2**20:>7.1f} {out_bytes / 1024:>7.0f}")
+    print(f"total: {totals[0]:.0f} ms -> {totals[1]:.0f} ms, "
+          f"decoded pixels {totals[2] / 2**20:.0f} MB -> {totals[3] / 2**20:.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
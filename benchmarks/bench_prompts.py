@@ -0,0 +1,146 @@
+"""Compare prompt sizes before and after the shared prompt builder.
+
+Run from the repository root:  python -m benchmarks.bench_prompts
+
+Offline it reports estimated (chars/4) tokens. With GEMINI_API_KEY set, pass
+--live to also report exact token counts from the API and the median
+generation latency of each prompt:
+
+    GEMINI_API_KEY=... python -m benchmarks.bench_prompts --live --repeats 5
+"""
+import argparse
+import datetime
+import os
+import statistics
+import time
+
+from voyagemind.model_router import CHAT, DEFAULT_POLICY, FULL_ITINERARY
+from voyagemind.prompt_builder import build_chat_prompt, build_itinerary_prompt, estimate_tokens
+
+TODAY = datetime.date(2026, 11, 2)
+TRIPS = {
+    "fully set": {
+        "destination": "Goa",
+        "budget": "Mid-range (₹15k-50k)",
+        "travelers": 2,
+        "start_date": TODAY,
+        "end_date": TODAY + datetime.timedelta(days=6),
+        "transport_mode": "Train 🚆",
+        "food_preference": "Vegetarian 🌱",
+        "interests": ["History & Culture", "Nature & Wildlife"],
+        "pace": "Relaxed",
+        "trip_type": "Family",
+    },
+    "mostly unset": {"destination": "Jaipur", "trip_type": "Leisure"},
+}
+QUESTION = "What are the best local transportation options?"
+
+
+def legacy_chat_prompt(trip):
+    """The f-string pages/chatbot.py used to send"""
+    start, end = trip.get("start_date"), trip.get("end_date")
+    days = (end - start).days if start and end else "Not Set"
+    return f"""User is planning a trip with these details:
+        - Destination: {trip.get("destination", "Not Set")}
+        - Duration: {days} days ({start or "Not Set"} to {end or "Not Set"})
+        - Budget: Rs. {trip.get("budget", "Not Set")} for {trip.get("travelers", "Not Set")} travelers
+        - Preferences: {'Not specified'}
+        - Transport: {trip.get("transport_mode")}
+        - Food: {trip.get("food_preference")}
+        
+        Current query: {QUESTION}
+        
+        Respond helpfully with specific recommendations when possible. 
+        Format responses with clear sections and emojis for better readability.
+        """
+
+
+def legacy_itinerary_prompt(trip):
+    """The f-string get_detailed_itinerary used to send, budget section included"""
+    return f"""
+    Create a detailed itinerary for 7-day trip to {trip.get("destination")} with budget Rs. {trip.get("budget", "Not Set")} for {trip.get("travelers", "Not Set")} travelers.
+    Dates: {trip.get("start_date", "upcoming date")} to {trip.get("end_date", "upcoming date")}
+    Preferences: None
+    Transportation: {trip.get("transport_mode", "Not Set")}
+    Food: {trip.get("food_preference", "Not Set")}
+    
+    Important Rules:
+    1. Use ONLY ASCII characters (no ₹, emoji, or special symbols)
+    2. Use "Rs." instead of any currency symbols
+    3. Return valid JSON with this structure:
+    {{
+        "title": "string",
+        "budget_breakdown": {{
+            "accommodation": "string",
+            "transportation": "string",
+            "food": "string",
+            "activities": "string",
+            "miscellaneous": "string",
+            "total": "string"
+        }},
+        "days": [
+            {{
+                "day": number,
+                "date": "string",
+                "activities": "string",
+                "accommodation": "string",
+                "meals": "string",
+                "transportation": "string",
+                "highlights": "string",
+                "tips": "string"
+            }}
+        ]
+    }}
+    """
+
+
+def live_model(task):
+    import google.generativeai as genai
+
+    genai.configure(api_key=os.environ["GEMINI_API_KEY"])
+    settings = DEFAULT_POLICY["tasks"][task]
+    model = genai.GenerativeModel(DEFAULT_POLICY["tiers"][settings["tier"]])
+    config = {"max_output_tokens": settings["max_output_tokens"], "temperature": settings["temperature"]}
+    return model, config
+
+
+def median_latency(model, config, prompt, repeats):
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        model.generate_content(prompt, generation_config=config)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--live", action="store_true", help="call Gemini for exact tokens and latency")
+    parser.add_argument("--repeats", type=int, default=3, help="live calls per prompt (median is reported)")
+    args = parser.parse_args()
+    if args.live and not os.environ.get("GEMINI_API_KEY"):
+        parser.error("--live needs GEMINI_API_KEY in the environment")
+    models = {kind: live_model(task) for kind, task in (("chat", CHAT), ("itinerary", FULL_ITINERARY))} if args.live else {}
+
+    header = f"{'prompt':<28} {'before':>8} {'after':>8} {'saved':>7}"
+    print(header + ("  exact tokens, median latency (s)" if args.live else "  (estimated tokens)"))
+    for name, trip in TRIPS.items():
+        pairs = [
+            ("chat", legacy_chat_prompt(trip), build_chat_prompt(trip, QUESTION)),
+            ("itinerary", legacy_itinerary_prompt(trip), build_itinerary_prompt(trip, 7)),
+        ]
+        for kind, before, after in pairs:
+            label = kind + " / " + name
+            if not args.live:
+                old, new = estimate_tokens(before), estimate_tokens(after)
+                print(f"{label:<28} {old:>8} {new:>8} {1 - new / old:>7.0%}")
+                continue
+            model, config = models[kind]
+            old, new = (model.count_tokens(p).total_tokens for p in (before, after))
+            print(f"{label:<28} {old:>8} {new:>8} {1 - new / old:>7.0%}")
+            slow, fast = (median_latency(model, config, p, args.repeats) for p in (before, after))
+            print(f"{'':<28} {slow:>8.2f} {fast:>8.2f} {1 - fast / slow:>7.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Time the local route optimizer on synthetic 50-stop days.
+
+Run from the repository root:  python -m benchmarks.bench_route_optimizer
+"""
+import random
+import statistics
+import time
+
+from voyagemind.route_optimizer import haversine_matrix, optimize_day
+
+STOPS = 50
+ROUNDS = 20
+# Roughly the Mumbai city limits
+LAT_RANGE = (18.90, 19.25)
+LON_RANGE = (72.80, 72.98)
+
+
+def synthetic_day(rng, stops=STOPS):
+    places = []
+    for i in range(stops):
+        opens = rng.choice([None, "08:00", "09:00", "10:00", "11:00"])
+        places.append({
+            "name": f"Stop {i + 1}",
+            "lat": rng.uniform(*LAT_RANGE),
+            "lon": rng.uniform(*LON_RANGE),
+            "opens": opens,
+            "closes": rng.choice([None, "17:00", "20:00", "23:00"]),
+            "visit_minutes": rng.choice([10, 15, 20, 30]),
+        })
+    return places
+
+
+def input_order_km(places):
+    dist = haversine_matrix([p["lat"] for p in places], [p["lon"] for p in places])
+    return float(sum(dist[i, i + 1] for i in range(len(places) - 1)))
+
+
+def main():
+    rng = random.Random(42)
+    timings, savings = [], []
+    for _ in range(ROUNDS):
+        places = synthetic_day(rng)
+        started = time.perf_counter()
+        route = optimize_day(places)
+        timings.append((time.perf_counter() - started) * 1000)
+        # optimize_day reports road-adjusted km; compare like with like
+        baseline = input_order_km(places) * 1.3
+        savings.append(1 - route["distance_km"] / baseline)
+
+    timings.sort()
+    print(f"{STOPS} stops x {ROUNDS} days")
+    print(f"  median {statistics.median(timings):.1f} ms  max {timings[-1]:.1f} ms")
+    print(f"  distance saved vs model order: {statistics.mean(savings):.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,362 @@
+"""Concurrent-session load test for the VoyageMind pages.
+
+Every simulated session fills in the home form, asks a few chat questions
+and generates an itinerary, using Streamlit's AppTest runner in-process.
+Gemini and SerpAPI are replaced by local stubs that sleep for a configurable
+latency, so the numbers reflect the server's own overhead and concurrency.
+
+Run from the repository root:
+
+    python -m benchmarks.load_test --levels 1,2,4,8,16 --chat-turns 3
+"""
+import argparse
+import contextlib
+import datetime
+import gc
+import io
+import json
+import os
+import statistics
+import tempfile
+import threading
+import time
+import warnings
+from types import SimpleNamespace
+from unittest import mock
+
+# The pages' dependencies are chatty about deprecations; keep the report readable
+warnings.simplefilter("ignore")
+
+import google.generativeai as genai  # noqa: E402
+import requests  # noqa: E402
+import streamlit as st  # noqa: E402
+from PIL import Image  # noqa: E402
+from streamlit import config, logger  # noqa: E402
+from streamlit.runtime import Runtime  # noqa: E402
+from streamlit.runtime.caching.storage.dummy_cache_storage import MemoryCacheStorageManager  # noqa: E402
+from streamlit.runtime.dataframe_source_manager import DataframeSourceManager  # noqa: E402
+from streamlit.runtime.media_file_manager import MediaFileManager  # noqa: E402
+from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage  # noqa: E402
+from streamlit.runtime.scriptrunner.script_cache import ScriptCache  # noqa: E402
+from streamlit.runtime.secrets import Secrets  # noqa: E402
+from streamlit.testing.v1 import AppTest, app_test, local_script_runner  # noqa: E402
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HOME = os.path.join(ROOT, "home.py")
+CHATBOT = os.path.join(ROOT, "pages", "chatbot.py")
+ITINERARY = os.path.join(ROOT, "pages", "itinerary.py")
+
+SECRETS = {"GEMINI_API_KEY": "stub", "SERP_API_KEY": "stub"}
+CHAT_QUESTIONS = [
+    "What are the must-see attractions?",
+    "Recommend good restaurants matching my food preferences",
+    "Suggest accommodations for my budget",
+    "What are the best local transportation options?",
+]
+RUN_TIMEOUT = 120
+SUBMIT_ATTEMPTS = 3
+
+
+class StubResponse:
+    """Enough of requests.Response for the pages' image and search calls"""
+
+    def __init__(self, payload=None, content=b"", content_type="application/json"):
+        self._payload = payload
+        self.content = content if payload is None else json.dumps(payload).encode()
+        self.status_code = 200
+        self.headers = {"Content-Type": content_type, "Content-Length": str(len(self.content))}
+
+    def json(self):
+        return self._payload
+
+    def iter_content(self, chunk_size=65536):
+        for i in range(0, len(self.content), chunk_size):
+            yield self.content[i:i + chunk_size]
+
+    def close(self):
+        pass
+
+
+class StubGeminiResponse:
+    def __init__(self, text, prompt):
+        self.text = text
+        # The model router logs and totals these per tier
+        self.usage_metadata = SimpleNamespace(
+            prompt_token_count=len(prompt) // 4,
+            candidates_token_count=len(text) // 4,
+        )
+
+
+class StubBackends:
+    """Patches Gemini and HTTP calls with fixed-latency local fakes"""
+
+    def __init__(self, llm_latency, serp_latency):
+        self.llm_latency = llm_latency
+        self.serp_latency = serp_latency
+        self.llm_calls = 0
+        self.http_calls = 0
+        self._lock = threading.Lock()
+        buffer = io.BytesIO()
+        Image.new("RGB", (2400, 1600), (90, 140, 200)).save(buffer, "JPEG", quality=85)
+        self._photo = buffer.getvalue()
+        self._patches = [
+            mock.patch.object(genai.GenerativeModel, "generate_content", self._generate_content),
+            mock.patch.object(requests, "get", self._get),
+        ]
+
+    def __enter__(self):
+        for patch in self._patches:
+            patch.start()
+        return self
+
+    def __exit__(self, *exc):
+        for patch in self._patches:
+            patch.stop()
+
+    def _generate_content(self, prompt, *args, **kwargs):
+        with self._lock:
+            self.llm_calls += 1
+        time.sleep(self.llm_latency)
+        prompt = prompt if isinstance(prompt, str) else str(prompt)
+        if "JSON" in prompt:
+            return StubGeminiResponse(json.dumps(self._itinerary()), prompt)
+        return StubGeminiResponse("**Here are a few ideas** for your trip. " * 20, prompt)
+
+    def _get(self, url, *args, **kwargs):
+        with self._lock:
+            self.http_calls += 1
+        time.sleep(self.serp_latency)
+        if "serpapi.com" in url:
+            results = [{"original": f"https://images.invalid/{i}.jpg"} for i in range(5)]
+            return StubResponse({"images_results": results})
+        return StubResponse(content=self._photo, content_type="image/jpeg")
+
+    def _itinerary(self):
+        places = [
+            {"name": "Calangute Beach", "opens": "06:00", "closes": "19:00", "visit_minutes": 120},
+            {"name": "Fort Aguada", "opens": "09:30", "closes": "18:00", "visit_minutes": 60},
+            {"name": "Basilica of Bom Jesus", "opens": "09:00", "closes": "18:30", "visit_minutes": 45},
+            {"name": "Baga Beach", "visit_minutes": 90},
+        ]
+        return {
+            "title": "Goa Getaway",
+            "days": [{
+                "day": i + 1,
+                "date": f"Day {i + 1}",
+                "activities": "Beaches, forts and churches",
+                "places": places,
+                "accommodation": "Beach resort",
+                "meals": "Seafood shacks",
+                "transportation": "Scooter",
+                "highlights": "Sunset at the fort",
+                "tips": "Start early to beat the heat",
+            } for i in range(7)],
+        }
+
+
+def pin_apptest_globals():
+    """Make AppTest safe to run from many threads at once.
+
+    Each AppTest.run() swaps process-wide state (the Runtime singleton,
+    st.secrets and a config option) and restores it afterwards, so
+    overlapping runs tear each other down. Real Streamlit sessions share one
+    runtime and one compiled-script cache too, so install those up front and
+    make the per-run swaps no-ops.
+    """
+    runtime = mock.MagicMock(spec=Runtime)
+    runtime.media_file_mgr = MediaFileManager(MemoryMediaFileStorage("/mock/media"))
+    runtime.dataframe_source_mgr = DataframeSourceManager()
+    runtime.cache_storage_manager = MemoryCacheStorageManager()
+    Runtime._instance = runtime
+    app_test.Runtime = type("DetachedRuntime", (), {})
+    # Compile every page once up front: CPython 3.11's parser is not safe to
+    # enter from several threads, and the server only compiles once anyway
+    script_cache = ScriptCache()
+    for page in (HOME, CHATBOT, ITINERARY):
+        script_cache.get_bytecode(page)
+    app_test.ScriptCache = local_script_runner.ScriptCache = lambda: script_cache
+
+    config.set_option("global.appTest", True)
+    logger.set_log_level("error")
+    app_test.patch_config_options = lambda options: contextlib.nullcontext()
+
+    secrets = Secrets()
+    secrets._secrets = {"api_keys": SECRETS}
+    st.secrets = secrets
+
+
+def resident_memory():
+    """Current process RSS in bytes"""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+def _timed_run(app, latencies, step):
+    started = time.perf_counter()
+    app.run(timeout=RUN_TIMEOUT)
+    latencies.append((step, time.perf_counter() - started))
+    if app.exception:
+        raise RuntimeError(f"{step} failed: {app.exception[0].value}")
+    return app
+
+
+def run_session(chat_turns, latencies, keep_alive, counters):
+    """One visitor: home form -> chat turns -> itinerary generation"""
+    today = datetime.date.today()
+
+    home = AppTest.from_file(HOME, default_timeout=RUN_TIMEOUT)
+    _timed_run(home, latencies, "home")
+    home.text_input[0].input("Goa")
+    home.date_input[0].set_value(today)
+    home.date_input[1].set_value(today + datetime.timedelta(days=6))
+    for _ in range(SUBMIT_ATTEMPTS):
+        next(b for b in home.button if "Generate Smart Itinerary" in b.label).click()
+        _timed_run(home, latencies, "home_submit")
+        user_data = dict(home.session_state["user_data"])
+        if "start_date" in user_data:
+            break
+        # AppTest occasionally drops a form trigger when runs overlap
+        counters["resubmits"] += 1
+    else:
+        raise RuntimeError("home form submission never reached session state")
+
+    chat = AppTest.from_file(CHATBOT, default_timeout=RUN_TIMEOUT)
+    chat.session_state["user_data"] = user_data
+    _timed_run(chat, latencies, "chat_load")
+    for turn in range(chat_turns):
+        chat.text_input(key="user_input").input(CHAT_QUESTIONS[turn % len(CHAT_QUESTIONS)])
+        _timed_run(chat, latencies, "chat_turn")
+
+    itinerary = AppTest.from_file(ITINERARY, default_timeout=RUN_TIMEOUT)
+    itinerary.session_state["user_data"] = user_data
+    _timed_run(itinerary, latencies, "itinerary_load")
+    itinerary.button[0].click()
+    _timed_run(itinerary, latencies, "itinerary_generate")
+
+    # Hold the session objects until the level finishes so RSS reflects live sessions
+    keep_alive.extend([home, chat, itinerary])
+
+
+def run_level(concurrency, chat_turns):
+    latencies, keep_alive, errors = [], [], []
+    counters = {"resubmits": 0}
+    peak_threads = threading.active_count()
+    done = threading.Event()
+
+    def monitor():
+        nonlocal peak_threads
+        while not done.is_set():
+            peak_threads = max(peak_threads, threading.active_count())
+            time.sleep(0.05)
+
+    def worker():
+        try:
+            run_session(chat_turns, latencies, keep_alive, counters)
+        except Exception as exc:
+            errors.append(repr(exc))
+
+    gc.collect()
+    rss_before = resident_memory()
+    watcher = threading.Thread(target=monitor, daemon=True)
+    watcher.start()
+    started = time.perf_counter()
+    workers = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    done.set()
+    watcher.join()
+    gc.collect()
+    rss_after = resident_memory()
+
+    completed = concurrency - len(errors)
+    values = [seconds for _, seconds in latencies]
+    by_step = {}
+    for step, seconds in latencies:
+        by_step.setdefault(step, []).append(seconds)
+    return {
+        "concurrency": concurrency,
+        "completed": completed,
+        "errors": errors[:5],
+        "resubmits": counters["resubmits"],
+        "elapsed_s": round(elapsed, 3),
+        "sessions_per_s": round(completed / elapsed, 3) if elapsed else 0.0,
+        "runs_per_s": round(len(values) / elapsed, 3) if elapsed else 0.0,
+        "p50_s": round(statistics.median(values), 3) if values else 0.0,
+        "p99_s": round(percentile(values, 99), 3),
+        "p99_by_step_s": {step: round(percentile(v, 99), 3) for step, v in sorted(by_step.items())},
+        "peak_threads": peak_threads,
+        "rss_mb": round(rss_after / 2**20, 1),
+        "rss_per_session_kb": round(max(0, rss_after - rss_before) / max(1, concurrency) / 1024, 1),
+    }
+
+
+def find_saturation(results, min_gain, slo):
+    """First level where throughput stops growing or p99 breaks the SLO"""
+    best = None
+    for result in results:
+        if result["errors"] or result["p99_s"] > slo:
+            return result["concurrency"]
+        if best is not None and result["sessions_per_s"] < best * (1 + min_gain):
+            return result["concurrency"]
+        best = max(best or 0.0, result["sessions_per_s"])
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--levels", default="1,2,4,8,16", help="comma separated concurrency steps")
+    parser.add_argument("--chat-turns", type=int, default=3)
+    parser.add_argument("--llm-latency", type=float, default=0.5, help="stub Gemini latency (s)")
+    parser.add_argument("--serp-latency", type=float, default=0.1, help="stub HTTP latency (s)")
+    parser.add_argument("--slo", type=float, default=5.0, help="p99 latency ceiling per script run (s)")
+    parser.add_argument("--min-gain", type=float, default=0.1, help="throughput gain needed to keep ramping")
+    parser.add_argument("--json", dest="json_path", help="write the full report to this file")
+    args = parser.parse_args()
+    levels = [int(level) for level in args.levels.split(",") if level.strip()]
+
+    # Pages write their PDFs to the working directory; keep that out of the repo
+    workdir = tempfile.mkdtemp(prefix="voyagemind-load-")
+    os.chdir(workdir)
+
+    pin_apptest_globals()
+    results = []
+    with StubBackends(args.llm_latency, args.serp_latency) as stubs:
+        # One untimed session first so imports and caches don't count as per-session memory
+        run_level(1, args.chat_turns)
+        print(f"{'conc':>5} {'sess/s':>8} {'runs/s':>8} {'p50 s':>7} {'p99 s':>7} {'threads':>8} {'RSS MB':>8} {'KB/sess':>8}")
+        for level in levels:
+            result = run_level(level, args.chat_turns)
+            results.append(result)
+            print(f"{level:>5} {result['sessions_per_s']:>8} {result['runs_per_s']:>8} {result['p50_s']:>7} "
+                  f"{result['p99_s']:>7} {result['peak_threads']:>8} {result['rss_mb']:>8} {result['rss_per_session_kb']:>8}")
+            for error in result["errors"]:
+                print(f"      error: {error}")
+            if result["p99_s"] > args.slo * 3:
+                print("      latency collapsed, stopping the ramp")
+                break
+
+    saturation = find_saturation(results, args.min_gain, args.slo)
+    print(f"stub calls: {stubs.llm_calls} Gemini, {stubs.http_calls} HTTP")
+    print(f"saturation point: {saturation if saturation else 'not reached'}")
+    if args.json_path:
+        with open(os.path.join(ROOT, args.json_path) if not os.path.isabs(args.json_path) else args.json_path, "w") as f:
+            json.dump({"levels": results, "saturation": saturation, "settings": vars(args)}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
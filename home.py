@@ -2,6 +2,7 @@ import streamlit as st
 import datetime
 from streamlit_extras.stylable_container import stylable_container
 from streamlit.components.v1 import html
+from voyagemind.profiling import finish_profiling, start_profiling
 
 # 🌍 Page Config
 st.set_page_config(
@@ -10,6 +11,7 @@ st.set_page_config(
     layout="wide",
     initial_sidebar_state="expanded"
 )
+profiler = start_profiling("home")
 
 # Fixed CSS with cursor solution
 st.markdown("""
@@ -248,4 +250,6 @@ document.addEventListener('DOMContentLoaded', function() {
     document.head.appendChild(style);
 });
 </script>
-""")
\ No newline at end of file
+""")
+
+finish_profiling(profiler)
\ No newline at end of file
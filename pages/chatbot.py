@@ -3,7 +3,10 @@ import google.generativeai as genai
 import datetime
 from streamlit.components.v1 import html
 from streamlit_extras.stylable_container import stylable_container
-from langchain.memory import ConversationBufferMemory
+from voyagemind.model_router import CHAT, QUICK_ANSWER, get_router
+from voyagemind.profiling import finish_profiling, start_profiling
+from voyagemind.prompt_builder import build_chat_prompt
+from voyagemind.session_store import current_session_store
 
 # 🌍 Page Config
 st.set_page_config(
@@ -12,15 +15,16 @@ st.set_page_config(
     layout="wide",
     initial_sidebar_state="collapsed"
 )
+profiler = start_profiling("chatbot")
 
 # Load API keys from Streamlit secrets
 GEMINI_API_KEY = st.secrets["api_keys"]["GEMINI_API_KEY"]
 
 
 
-# Configure Gemini
+# Configure Gemini; the router picks the model tier per task
 genai.configure(api_key=GEMINI_API_KEY)
-model = genai.GenerativeModel("gemini-1.5-pro-latest")
+router = get_router(st.secrets.get("model_router"))
 
 # Custom CSS
 st.markdown("""
@@ -84,17 +88,16 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-# Initialize session state
-if "memory" not in st.session_state:
-    st.session_state.memory = ConversationBufferMemory()
-if "chat_history" not in st.session_state:
-    st.session_state.chat_history = []
+# Initialize session state (the transcript lives in the compact session store)
+session_store = current_session_store()
 if "show_itinerary" not in st.session_state:
     st.session_state.show_itinerary = False
 if "pending_query" not in st.session_state:
     st.session_state.pending_query = ""
 if "processing" not in st.session_state:
     st.session_state.processing = False
+if "pending_task" not in st.session_state:
+    st.session_state.pending_task = CHAT
 
 # Retrieve user preferences
 user_data = st.session_state.get("user_data", {})
@@ -213,18 +216,26 @@ action_cols = st.columns(4)
 with action_cols[0]:
     if st.button("📍 Top Attractions", key="attractions_btn", help="Get top attractions for your destination"):
         st.session_state.pending_query = "What are the must-see attractions?"
+        st.session_state.pending_task = QUICK_ANSWER
+        finish_profiling(profiler, before_rerun=True)
         st.rerun()
 with action_cols[1]:
     if st.button("🍽️ Food Spots", key="food_btn", help="Find great places to eat"):
         st.session_state.pending_query = "Recommend good restaurants matching my food preferences"
+        st.session_state.pending_task = QUICK_ANSWER
+        finish_profiling(profiler, before_rerun=True)
         st.rerun()
 with action_cols[2]:
     if st.button("🏨 Accommodation", key="hotel_btn", help="Find places to stay"):
         st.session_state.pending_query = "Suggest accommodations for my budget"
+        st.session_state.pending_task = QUICK_ANSWER
+        finish_profiling(profiler, before_rerun=True)
         st.rerun()
 with action_cols[3]:
     if st.button("🚗 Local Transport", key="transport_btn", help="Get transport options"):
         st.session_state.pending_query = "What are the best local transportation options?"
+        st.session_state.pending_task = QUICK_ANSWER
+        finish_profiling(profiler, before_rerun=True)
         st.rerun()
 
 # Chat Container
@@ -243,7 +254,7 @@ with stylable_container(
         }
     """
 ):
-    for role, message in st.session_state.chat_history:
+    for role, message in session_store.history():
         if role == "User":
             st.markdown(f"<div class='user-message'>{message}</div>", unsafe_allow_html=True)
         else:
@@ -273,38 +284,30 @@ with stylable_container(
 if user_query and user_query != st.session_state.get("last_processed_query", "") and not st.session_state.processing:
     st.session_state.processing = True
     st.session_state.last_processed_query = user_query
-    st.session_state.chat_history.append(("User", user_query))
+    session_store.append("User", user_query)
+    # Quick actions only count while the user kept the canned question
+    task = st.session_state.pending_task if user_query == st.session_state.pending_query else CHAT
     st.session_state.pending_query = ""
+    st.session_state.pending_task = CHAT
     
     try:
-        # Build context
-        context = f"""User is planning a trip with these details:
-        - Destination: {destination}
-        - Duration: {days} days ({formatted_start_date} to {formatted_end_date})
-        - Budget: Rs. {budget} for {travelers} travelers
-        - Preferences: {preferences if preferences else 'Not specified'}
-        - Transport: {transport_mode}
-        - Food: {food_preference}
-        
-        Current query: {user_query}
-        
-        Respond helpfully with specific recommendations when possible. 
-        Format responses with clear sections and emojis for better readability.
-        """
+        # Build a compact prompt from the preferences that are actually set
+        context = build_chat_prompt(user_data, user_query, router.max_input_tokens(task))
         
         # Generate response
-        response = model.generate_content(context)
+        response = router.generate(task, context)
         response_text = response.text if hasattr(response, "text") else "I couldn't generate a response. Please try again."
         
-        # Save to memory and chat history
-        st.session_state.memory.save_context({"user": user_query}, {"AI": response_text})
-        st.session_state.chat_history.append(("AI", response_text))
+        # Save to the session's message log
+        session_store.append("AI", response_text)
         
     except Exception as e:
         st.error(f"⚠️ Error: {str(e)}")
-        st.session_state.chat_history.append(("AI", "Sorry, I encountered an error. Please try again."))
+        session_store.append("AI", "Sorry, I encountered an error. Please try again.")
     finally:
         st.session_state.processing = False
+        # Keep this run's profile; the rerun below shows it
+        finish_profiling(profiler, before_rerun=True)
         st.rerun()
 
 # Add some JavaScript to enhance the chat experience
@@ -325,3 +328,6 @@ document.addEventListener('DOMContentLoaded', function() {
 });
 </script>
 """)
+
+
+finish_profiling(profiler)
\ No newline at end of file
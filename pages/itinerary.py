@@ -3,17 +3,24 @@ import google.generativeai as genai
 import requests
 import json
 from fpdf import FPDF
-import io
-from PIL import Image
 import re
 from datetime import datetime, timedelta, date
+from voyagemind.budget import format_rupees, plan_budget
+from voyagemind.image_pipeline import fetch_preview
+from voyagemind.model_router import FULL_ITINERARY, get_router
+from voyagemind.packing import build_packing_list
+from voyagemind.profiling import finish_profiling, start_profiling
+from voyagemind.prompt_builder import build_itinerary_prompt
+from voyagemind.route_optimizer import optimize_day
+
+profiler = start_profiling("itinerary")
 
 # API KEYS
 GEMINI_API_KEY = st.secrets["api_keys"]["GEMINI_API_KEY"]
 
 SERP_API_KEY = st.secrets["api_keys"]["SERP_API_KEY"]
 genai.configure(api_key=GEMINI_API_KEY)
-model = genai.GenerativeModel("gemini-1.5-pro-latest")
+router = get_router(st.secrets.get("model_router"))
 
 # User Inputs
 user_data = st.session_state.get("user_data", {})
@@ -22,9 +29,6 @@ budget = user_data.get("budget", "Not Set")
 travelers = user_data.get("travelers", "Not Set")
 start_date = user_data.get("start_date", "Not Set")
 end_date = user_data.get("end_date", "Not Set")
-preferences = user_data.get("preferences", [])
-transport_mode = user_data.get("transport_mode", "Not Set")
-food_preference = user_data.get("food_preference", "Not Set")
 
 # Calculate number of days
 if isinstance(start_date, datetime) and isinstance(end_date, datetime):
@@ -41,50 +45,20 @@ def clean_text(text):
     text = text.replace("₹", "Rs.")
     return ''.join(char for char in text if ord(char) < 128)
 
-def get_detailed_itinerary(destination, days, budget, preferences, transport_mode, food_preference, start_date, travelers):
+def get_detailed_itinerary(trip, days):
     """Generate a structured itinerary using Gemini with strict ASCII output"""
-    days = (end_date - start_date).days + 1
-    start_date_str = start_date.strftime('%d %B %Y') if isinstance(start_date, (date, datetime)) else "upcoming date"
-    end_date_str = end_date.strftime('%d %B %Y') if isinstance(end_date, (date, datetime)) else "upcoming date"
-    
-    prompt = f"""
-    Create a detailed itinerary for {days}-day trip to {destination} with budget Rs. {budget} for {travelers} travelers.
-    Dates: {start_date_str} to {end_date_str}
-    Preferences: {', '.join(preferences) if preferences else 'None'}
-    Transportation: {transport_mode}
-    Food: {food_preference}
+    destination = trip.get("destination", "Not Set")
+    travelers = trip.get("travelers", "Not Set")
+    transport_mode = trip.get("transport_mode", "Not Set")
+    food_preference = trip.get("food_preference", "Not Set")
+    start_date, end_date = trip.get("start_date"), trip.get("end_date")
+    if isinstance(start_date, date) and isinstance(end_date, date):
+        days = (end_date - start_date).days + 1
     
-    Important Rules:
-    1. Use ONLY ASCII characters (no ₹, emoji, or special symbols)
-    2. Use "Rs." instead of any currency symbols
-    3. Return valid JSON with this structure:
-    {{
-        "title": "string",
-        "budget_breakdown": {{
-            "accommodation": "string",
-            "transportation": "string",
-            "food": "string",
-            "activities": "string",
-            "miscellaneous": "string",
-            "total": "string"
-        }},
-        "days": [
-            {{
-                "day": number,
-                "date": "string",
-                "activities": "string",
-                "accommodation": "string",
-                "meals": "string",
-                "transportation": "string",
-                "highlights": "string",
-                "tips": "string"
-            }}
-        ]
-    }}
-    """
-
     try:
-        response = model.generate_content(prompt)
+        # Same trip facts as the chat prompt, including interests, pace and special needs
+        prompt = build_itinerary_prompt(trip, days, router.max_input_tokens(FULL_ITINERARY))
+        response = router.generate(FULL_ITINERARY, prompt)
         response_text = response.text
         response_text = re.sub(r'^```json\s*', '', response_text)
         response_text = re.sub(r'\s*```\s*$', '', response_text)
@@ -108,6 +82,7 @@ def get_detailed_itinerary(destination, days, budget, preferences, transport_mod
                         "day": i+1,
                         "date": day_date_str,
                         "activities": f"Day {i+1}: Explore {destination}",
+                        "places": [],
                         "accommodation": f"Accommodation for {travelers}",
                         "meals": food_preference,
                         "transportation": transport_mode,
@@ -123,11 +98,11 @@ def get_detailed_itinerary(destination, days, budget, preferences, transport_mod
         st.error(f"Error generating itinerary: {e}")
         fallback_data = {
             "title": f"{days}-Day {destination} Trip",
-            "budget_breakdown": {"total": f"Rs. {budget}"},
             "days": [{
                 "day": i+1,
                 "date": (start_date + timedelta(days=i)).strftime('%A, %d %B %Y') if isinstance(start_date, (date, datetime)) else f"Day {i+1}",
                 "activities": f"Day {i+1} activities",
+                "places": [],
                 "accommodation": "Standard accommodation",
                 "meals": food_preference,
                 "transportation": transport_mode,
@@ -138,18 +113,17 @@ def get_detailed_itinerary(destination, days, budget, preferences, transport_mod
         return fallback_data
 
 def get_location_images(destination, count=3):
-    """Get destination images with error handling"""
+    """Get downscaled destination images as compact JPEG bytes with error handling"""
     images = []
     try:
         url = f"https://serpapi.com/search.json?q={destination} tourist attractions&tbm=isch&api_key={SERP_API_KEY}"
         response = requests.get(url)
         if response.status_code == 200 and 'images_results' in response.json():
-            for i in range(min(count, len(response.json()['images_results']))):
+            for result in response.json()['images_results']:
+                if len(images) >= count:
+                    break
                 try:
-                    img_url = response.json()['images_results'][i]['original']
-                    img_response = requests.get(img_url)
-                    if img_response.status_code == 200:
-                        images.append(Image.open(io.BytesIO(img_response.content)))
+                    images.append(fetch_preview(result['original']))
                 except Exception:
                     continue
     except Exception:
@@ -182,17 +156,27 @@ def generate_itinerary_pdf(itinerary_data, images=None):
         pdf.cell(0, 10, strict_ascii(f"Budget: Rs. {budget}"), 0, 1)  # Rs. instead of ₹
         pdf.ln(10)
         
-        # Budget breakdown (force cleaned)
-        if "budget_breakdown" in itinerary_data:
+        # Budget breakdown (computed locally)
+        budget_plan = itinerary_data.get("budget_plan")
+        if budget_plan:
             pdf.set_font("Arial", 'B', 14)
             pdf.cell(0, 10, "Budget Breakdown", 0, 1)
+            pdf.set_font("Arial", 'B', 10)
+            for heading in ("Category", "Total", "Per day", "Per traveler/day"):
+                pdf.cell(47.5, 8, heading, 1)
+            pdf.ln()
             pdf.set_font("Arial", '', 10)
             
-            for category, amount in itinerary_data["budget_breakdown"].items():
-                clean_cat = strict_ascii(category).capitalize()
-                clean_amt = strict_ascii(amount)
-                pdf.cell(95, 8, f"{clean_cat}:", 1)
-                pdf.cell(95, 8, clean_amt, 1, 1)
+            for row in budget_plan["rows"] + [{
+                "category": "Total",
+                "total": budget_plan["total"],
+                "per_day": budget_plan["per_day"],
+                "per_traveler_per_day": budget_plan["per_traveler_per_day"],
+            }]:
+                pdf.cell(47.5, 8, strict_ascii(row["category"]), 1)
+                pdf.cell(47.5, 8, format_rupees(row["total"]), 1)
+                pdf.cell(47.5, 8, format_rupees(row["per_day"]), 1)
+                pdf.cell(47.5, 8, format_rupees(row["per_traveler_per_day"]), 1, 1)
             pdf.ln(5)
         
         # Daily itinerary (force cleaned)
@@ -214,6 +198,12 @@ def generate_itinerary_pdf(itinerary_data, images=None):
                 pdf.ln(4)
             
             add_cleaned_section("Activities", day.get("activities", ""))
+            route = day.get("route") or {}
+            if route.get("stops"):
+                add_cleaned_section(
+                    "Optimized Route",
+                    f"{' -> '.join(route['stops'])} (approx. {route['travel_minutes']} min travel, {route['distance_km']} km)"
+                )
             add_cleaned_section("Accommodation", day.get("accommodation", ""))
             add_cleaned_section("Meals", day.get("meals", ""))
             add_cleaned_section("Transportation", day.get("transportation", ""))
@@ -226,6 +216,18 @@ def generate_itinerary_pdf(itinerary_data, images=None):
             
             pdf.ln(10)
         
+        # Packing list (rule-based, built locally)
+        packing_list = itinerary_data.get("packing_list")
+        if packing_list:
+            pdf.set_font("Arial", 'B', 14)
+            pdf.cell(0, 10, "Packing List", 0, 1)
+            for title, items in packing_list["sections"].items():
+                pdf.set_font("Arial", 'B', 10)
+                pdf.cell(0, 8, strict_ascii(title) + ":", 0, 1)
+                pdf.set_font("Arial", '', 10)
+                pdf.multi_cell(0, 6, strict_ascii("\n".join(f"- {item}" for item in items)))
+                pdf.ln(4)
+        
         # Save PDF
         pdf_output = "VoyageMind_Itinerary.pdf"
         pdf.output(pdf_output)
@@ -252,10 +254,16 @@ if st.button("✅ Generate Itinerary"):
         images = get_location_images(destination)
     
     with st.spinner("Creating your travel plan..."):
-        itinerary_data = get_detailed_itinerary(
-            destination, days, budget, preferences,
-            transport_mode, food_preference, start_date, travelers
-        )
+        itinerary_data = get_detailed_itinerary(user_data, days)
+    
+    with st.spinner("Optimizing daily routes..."):
+        for day in itinerary_data.get("days", []):
+            day["route"] = optimize_day(day.get("places", []))
+    
+    itinerary_data["budget_plan"] = plan_budget(
+        budget, destination, len(itinerary_data.get("days", [])) or days, travelers
+    )
+    itinerary_data["packing_list"] = build_packing_list(user_data)
     
     with st.spinner("Generating PDF..."):
         itinerary_pdf = generate_itinerary_pdf(itinerary_data, images)
@@ -268,6 +276,48 @@ if st.button("✅ Generate Itinerary"):
         st.write(f"Dates: {start_date.strftime('%d %B %Y')} to {end_date.strftime('%d %B %Y')}")
     st.write(f"Budget: Rs. {budget}")
     
+    budget_plan = itinerary_data["budget_plan"]
+    if budget_plan:
+        st.subheader("Budget Breakdown")
+        st.table([
+            {
+                "Category": row["category"],
+                "Total": format_rupees(row["total"]),
+                "Per day": format_rupees(row["per_day"]),
+                "Per traveler / day": format_rupees(row["per_traveler_per_day"]),
+            }
+            for row in budget_plan["rows"]
+        ])
+        st.caption(
+            f"Total {format_rupees(budget_plan['total'])} for {budget_plan['travelers']} travelers over "
+            f"{budget_plan['days']} days ({format_rupees(budget_plan['per_traveler_per_day'])} per traveler per day)"
+        )
+    
+    st.subheader("Daily Routes")
+    for day in itinerary_data.get("days", []):
+        route = day.get("route") or {}
+        if not route.get("stops"):
+            continue
+        with st.expander(f"Day {day.get('day', '')}: {day.get('date', '')}"):
+            st.write(" → ".join(route["stops"]))
+            st.caption(f"Estimated travel: {route['travel_minutes']} min ({route['distance_km']} km)")
+            if route["late_stops"]:
+                st.warning(f"May be closed on arrival: {', '.join(route['late_stops'])}")
+    
+    packing_list = itinerary_data["packing_list"]
+    st.subheader("Packing List")
+    weather = packing_list["weather"]
+    if weather:
+        st.caption(
+            f"Typical weather for your dates: {weather['low_c']}-{weather['high_c']}°C, "
+            f"up to {weather['rain_mm']} mm of rain in the wettest month"
+        )
+    else:
+        st.caption("No climate data for this destination yet, so check the forecast before you pack")
+    for title, items in packing_list["sections"].items():
+        with st.expander(f"{title} ({len(items)})"):
+            st.markdown("\n".join(f"- {item}" for item in items))
+    
     with open(itinerary_pdf, "rb") as file:
         st.download_button(
             "📥 Download Itinerary", 
@@ -275,3 +325,6 @@ if st.button("✅ Generate Itinerary"):
             file_name=f"{destination}_Itinerary.pdf", 
             mime="application/pdf"
         )
+
+
+finish_profiling(profiler)
\ No newline at end of file
@@ -0,0 +1,18 @@
+import itertools
+
+from voyagemind.budget import plan_budget
+
+BUDGETS = ["Budget (₹5k-15k)", "Mid-range (₹15k-50k)", "Luxury (₹50k+)"]
+
+
+def test_columns_add_up_to_the_total_row():
+    for budget, destination, days, travelers in itertools.product(BUDGETS, ["Goa", "Paris", "Nowhere"], [1, 3, 7], [1, 2, 3]):
+        plan = plan_budget(budget, destination, days, travelers)
+        for column in ("total", "per_day", "per_traveler_per_day"):
+            assert sum(row[column] for row in plan["rows"]) == plan[column], (budget, destination, days, travelers, column)
+
+
+def test_cost_index_matches_whole_place_names_only():
+    assert plan_budget(BUDGETS[0], "Baliganj, Kolkata", 3, 2)["cost_index"] == "kolkata"
+    assert plan_budget(BUDGETS[0], "Romeo", 3, 2)["cost_index"] == "default"
+    assert plan_budget(BUDGETS[0], "Bali, Indonesia", 3, 2)["cost_index"] == "bali"
@@ -0,0 +1,53 @@
+import io
+
+import pytest
+from PIL import Image
+
+from voyagemind import image_pipeline
+from voyagemind.image_pipeline import ImageRejected, downscale
+
+
+def test_downscale_applies_exif_orientation():
+    exif = Image.Exif()
+    exif[0x0112] = 6  # rotate 90 degrees clockwise, as portrait phone photos are tagged
+    data = io.BytesIO()
+    Image.new("RGB", (3000, 2000)).save(data, "JPEG", exif=exif.tobytes())
+    with Image.open(io.BytesIO(downscale(data.getvalue()))) as out:
+        assert out.size == (683, 1024)
+        assert 0x0112 not in out.getexif()
+
+
+class FakeResponse:
+    def __init__(self, content, content_type):
+        self.content = content
+        self.status_code = 200
+        self.headers = {"Content-Type": content_type, "Content-Length": str(len(content))}
+        self.chunks_read = 0
+
+    def iter_content(self, chunk_size):
+        for i in range(0, len(self.content), chunk_size):
+            self.chunks_read += 1
+            yield self.content[i:i + chunk_size]
+
+    def close(self):
+        pass
+
+
+def test_unrecognised_downloads_are_rejected_at_the_first_probe(monkeypatch):
+    response = FakeResponse(b"\x00\x00\x00\x18ftypheic" + bytes(8 * 1024 * 1024 - 12), "image/heic")
+    monkeypatch.setattr(image_pipeline.requests, "get", lambda *args, **kwargs: response)
+    parses = []
+    read_header = image_pipeline._read_header
+    monkeypatch.setattr(image_pipeline, "_read_header", lambda data: parses.append(len(data)) or read_header(data))
+    with pytest.raises(ImageRejected, match="unrecognised"):
+        image_pipeline.fetch_image("https://images.invalid/photo.heic")
+    assert response.chunks_read == 1
+    assert len(parses) == 1
+
+
+def test_headers_longer_than_the_probe_are_retried(monkeypatch):
+    data = io.BytesIO()
+    Image.new("RGB", (4000, 3000)).save(data, "JPEG", icc_profile=b"x" * 60000, exif=b"Exif\x00\x00" + b"y" * 60000)
+    response = FakeResponse(data.getvalue(), "image/jpeg")
+    monkeypatch.setattr(image_pipeline.requests, "get", lambda *args, **kwargs: response)
+    assert image_pipeline.fetch_image("https://images.invalid/photo.jpg") == data.getvalue()
@@ -0,0 +1,80 @@
+import logging
+from types import SimpleNamespace
+
+import pytest
+
+from voyagemind import model_router
+from voyagemind.prompt_builder import PromptTooLarge
+
+
+def test_profiler_stats_do_not_pin_the_default_policy(monkeypatch, caplog):
+    monkeypatch.setattr(model_router, "_router", None)
+    monkeypatch.setattr(model_router, "_warned_policy_change", False)
+    assert model_router.router_stats() == {}
+    router = model_router.get_router({"tiers": {"quality": "gemini-2.0-pro"}})
+    assert router.policy["tiers"]["quality"] == "gemini-2.0-pro"
+    assert router.policy["tiers"]["fast"] == model_router.DEFAULT_POLICY["tiers"]["fast"]
+
+    with caplog.at_level(logging.WARNING, logger="voyagemind.model_router"):
+        assert model_router.get_router({"tiers": {"quality": "gemini-2.5-pro"}}) is router
+        assert model_router.get_router({"tiers": {"quality": "gemini-2.0-pro"}}) is router
+    assert router.policy["tiers"]["quality"] == "gemini-2.0-pro"
+    assert len(caplog.records) == 1
+
+
+class FakeModel:
+    def __init__(self):
+        self.prompts = []
+
+    def generate_content(self, prompt, generation_config=None):
+        self.prompts.append(prompt)
+        return SimpleNamespace(text="ok", usage_metadata=SimpleNamespace(prompt_token_count=10, candidates_token_count=5))
+
+
+def router_with_fakes(policy=None):
+    router = model_router.ModelRouter(policy)
+    fakes = {tier: FakeModel() for tier in router.policy["tiers"]}
+    router._models.update({name: fakes[tier] for tier, name in router.policy["tiers"].items()})
+    return router, fakes
+
+
+def test_secrets_overrides_merge_into_the_default_policy():
+    router = model_router.ModelRouter({"tasks": {model_router.CHAT: {"tier": "fast"}}, "slo_seconds": {"quality": 5}})
+    assert router.policy["tasks"][model_router.CHAT]["tier"] == "fast"
+    assert router.policy["tasks"][model_router.CHAT]["max_output_tokens"] == 2048
+    assert router.policy["slo_seconds"] == {"quality": 5}
+    assert router.policy["tiers"] == model_router.DEFAULT_POLICY["tiers"]
+
+
+def test_downgrades_while_p90_is_over_the_slo_and_recovers_when_samples_expire(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(model_router.time, "monotonic", lambda: clock[0])
+    router, _ = router_with_fakes()
+    for _ in range(10):
+        router._record("quality", 30.0)
+    assert router.route(model_router.CHAT)[0] == "fast"
+    # Full itineraries are never downgraded
+    assert router.route(model_router.FULL_ITINERARY)[0] == "quality"
+
+    clock[0] += router.policy["latency_max_age_seconds"] + 1
+    assert router.recent_latency("quality") == 0.0
+    assert router.route(model_router.CHAT)[0] == "quality"
+
+
+def test_fast_samples_keep_the_quality_tier():
+    router, _ = router_with_fakes()
+    for _ in range(10):
+        router._record("quality", 2.0)
+    router._record("quality", 60.0)
+    assert router.route(model_router.CHAT)[0] == "quality"
+
+
+def test_oversized_prompts_are_rejected_before_any_call():
+    router, fakes = router_with_fakes({"tasks": {model_router.QUICK_ANSWER: {"max_input_tokens": 10}}})
+    with pytest.raises(PromptTooLarge):
+        router.generate(model_router.QUICK_ANSWER, "x" * 41)
+    assert not any(fake.prompts for fake in fakes.values())
+
+    router.generate(model_router.QUICK_ANSWER, "x" * 40)
+    assert fakes["fast"].prompts == ["x" * 40]
+    assert router.stats()["fast"]["prompt_tokens"] == 10
@@ -0,0 +1,72 @@
+import datetime
+
+from voyagemind.packing import (
+    INTERNATIONAL,
+    TRANSPORT_RULES,
+    WEATHER_RULES,
+    build_packing_list,
+    find_region,
+    load_climate,
+)
+
+
+def region_of(destination):
+    regions, _, _ = load_climate()
+    index = find_region(destination)
+    return regions[index] if index is not None else None
+
+
+def test_find_region_matches_whole_place_names_only():
+    assert region_of("Romeo") is None
+    assert region_of("Baliganj") is None
+    assert region_of("Malegaon") is None
+    assert region_of("Goalpara") is None
+    assert region_of("Rome, Italy") == region_of("rome")
+    assert region_of("North Goa") == region_of("goa")
+    assert region_of("Port Blair, Andaman") == "andaman"
+
+
+def trip(destination, month, days=3, **prefs):
+    start = datetime.date(2026, month, 10)
+    return {"destination": destination, "start_date": start, "end_date": start + datetime.timedelta(days=days - 1), **prefs}
+
+
+def test_weather_thresholds():
+    assert set(WEATHER_RULES["hot"]) <= set(build_packing_list(trip("Goa", 4))["sections"]["Weather"])
+    monsoon = build_packing_list(trip("Goa", 7))["sections"]["Weather"]
+    assert set(WEATHER_RULES["wet"]) <= set(monsoon) and not set(WEATHER_RULES["hot"]) & set(monsoon)
+    assert build_packing_list(trip("Paris", 1))["sections"]["Weather"] == WEATHER_RULES["cold"]
+    assert build_packing_list(trip("Rome", 4))["sections"]["Weather"] == WEATHER_RULES["cool"]
+    leh = build_packing_list(trip("Leh, Ladakh", 1))["sections"]["Weather"]
+    assert leh == WEATHER_RULES["cold"] + WEATHER_RULES["freezing"]
+
+
+def test_unknown_destinations_get_no_weather_section():
+    packing = build_packing_list(trip("Atlantis", 1))
+    assert packing["weather"] is None
+    assert "Weather" not in packing["sections"]
+
+
+def test_passport_items_only_for_trips_outside_india():
+    assert not set(INTERNATIONAL) & set(build_packing_list(trip("Goa", 4))["sections"]["Essentials"])
+    assert not set(INTERNATIONAL) & set(build_packing_list(trip("Port Blair", 4))["sections"]["Essentials"])
+    assert set(INTERNATIONAL) <= set(build_packing_list(trip("Paris", 4))["sections"]["Essentials"])
+    assert set(INTERNATIONAL) <= set(build_packing_list(trip("Atlantis", 4))["sections"]["Essentials"])
+
+
+def test_items_appear_once_in_the_first_section_that_needs_them():
+    packing = build_packing_list(trip(
+        "Goa", 4, interests=["Wellness & Spa"], trip_type="Honeymoon", pace="Fast-paced",
+        special_needs=["Senior Friendly"], transport_mode="Flight ✈️",
+    ))
+    items = [item for section in packing["sections"].values() for item in section]
+    assert len(items) == len(set(items))
+    assert items.count("Swimwear") == 1
+    assert packing["sections"]["Journey"] == TRANSPORT_RULES["Flight"]
+
+
+def test_long_trips_plan_on_laundry():
+    clothing = build_packing_list(trip("Goa", 4, days=12))["sections"]["Clothing"]
+    assert clothing[0] == "7 tops / shirts"
+    assert "Travel laundry kit (detergent sheets, clothesline)" in clothing
+    assert "Travel laundry kit (detergent sheets, clothesline)" not in build_packing_list(trip("Goa", 4))["sections"]["Clothing"]
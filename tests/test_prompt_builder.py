@@ -0,0 +1,53 @@
+import datetime
+
+import pytest
+
+from voyagemind.prompt_builder import (
+    CHAT_PREFIX,
+    TRIM_MARKER,
+    PromptTooLarge,
+    build_chat_prompt,
+    estimate_tokens,
+    fit_to_budget,
+    trip_facts,
+)
+
+TRIP = {
+    "destination": "Goa",
+    "start_date": datetime.date(2026, 11, 2),
+    "end_date": datetime.date(2026, 11, 4),
+    "budget": "Budget (₹5k-15k)",
+    "interests": ["Food & Drink"],
+}
+
+
+def test_trip_facts_omit_unset_fields():
+    facts = trip_facts({**TRIP, "travelers": "Not Set", "pace": None, "special_needs": [], "food_preference": ""})
+    assert "- Destination: Goa" in facts
+    assert "- Duration: 3 days" in facts
+    assert "- Interests: Food & Drink" in facts
+    assert "Travelers" not in facts
+    assert "Pace" not in facts
+    assert "Special needs" not in facts
+    assert "Food:" not in facts
+    assert trip_facts({"destination": "Not Set"}) == ""
+
+
+def test_prompts_under_budget_are_untouched():
+    prompt = build_chat_prompt(TRIP, "Where should we eat?", max_tokens=1000)
+    assert prompt.startswith(CHAT_PREFIX)
+    assert prompt.endswith("Question: Where should we eat?")
+
+
+def test_only_the_tail_is_trimmed_to_fit():
+    question = "Tell me everything about Goa. " * 200
+    prompt = build_chat_prompt(TRIP, question, max_tokens=150)
+    assert estimate_tokens(prompt) <= 150
+    assert prompt.startswith(CHAT_PREFIX)
+    assert "- Destination: Goa" in prompt
+    assert prompt.endswith(TRIM_MARKER)
+
+
+def test_raises_when_the_fixed_part_alone_is_over_budget():
+    with pytest.raises(PromptTooLarge):
+        fit_to_budget(CHAT_PREFIX, TRIP, "Question: hi", max_tokens=20)
@@ -0,0 +1,33 @@
+import itertools
+
+import numpy as np
+
+from voyagemind.route_optimizer import ROAD_DETOUR_FACTOR, _parse_clock, haversine_matrix, optimize_day
+
+
+def test_parse_clock_rejects_out_of_range_times():
+    assert _parse_clock("09:30") == 570
+    assert _parse_clock("23:59") == 23 * 60 + 59
+    assert _parse_clock("25:99") is None
+    assert _parse_clock("12:60") is None
+    assert _parse_clock("-1:00") is None
+    assert _parse_clock("noon") is None
+
+
+def test_out_of_range_hours_do_not_mark_stops_late():
+    result = optimize_day([
+        {"name": "A", "lat": 15.50, "lon": 73.80, "opens": "25:99", "closes": "99:00"},
+        {"name": "B", "lat": 15.51, "lon": 73.81},
+    ])
+    assert result["late_stops"] == []
+    assert result["arrivals"][0] == "09:00"
+
+
+def test_three_stop_days_get_the_shortest_path():
+    rng = np.random.default_rng(7)
+    for _ in range(400):
+        coords = rng.uniform([15.3, 73.7], [15.7, 74.1], size=(3, 2))
+        places = [{"name": str(i), "lat": lat, "lon": lon} for i, (lat, lon) in enumerate(coords)]
+        dist = haversine_matrix(coords[:, 0], coords[:, 1]) * ROAD_DETOUR_FACTOR
+        shortest = min(dist[a, b] + dist[b, c] for a, b, c in itertools.permutations(range(3)))
+        assert optimize_day(places)["distance_km"] == round(shortest, 1)
@@ -0,0 +1,61 @@
+import os
+import stat
+import time
+
+from voyagemind import session_store
+from voyagemind.session_store import MessageLog, SessionStore
+
+
+def test_capped_log_reclaims_dropped_slots():
+    log = MessageLog(max_bytes=4096)
+    for i in range(2000):
+        log.append("User", f"question {i} " + "x" * 50)
+    assert log.nbytes <= 4096
+    assert len(log._blobs) <= 2 * len(log._index)
+    assert list(log)[-1] == ("User", "question 1999 " + "x" * 50)
+
+
+def test_repeated_messages_survive_compaction():
+    log = MessageLog(max_bytes=2048)
+    for i in range(500):
+        log.append("AI", "Sorry, I encountered an error. Please try again.")
+        log.append("User", f"try {i}")
+    assert list(log)[-2:] == [("AI", "Sorry, I encountered an error. Please try again."), ("User", "try 499")]
+
+
+def test_offloaded_transcripts_are_owner_only(tmp_path, monkeypatch):
+    monkeypatch.setattr(session_store, "OFFLOAD_DIR", str(tmp_path / "sessions"))
+    store = SessionStore("abc")
+    store.append("User", "hello")
+    assert store.offload(now=store.last_seen + session_store.IDLE_OFFLOAD_SECONDS + 1) > 0
+    assert stat.S_IMODE(os.stat(session_store.OFFLOAD_DIR).st_mode) == 0o700
+    assert stat.S_IMODE(os.stat(store.offload_path).st_mode) == 0o600
+    store.touch()
+    assert store.history() == [("User", "hello")]
+
+
+def test_sweep_skips_sessions_touched_after_it_started(tmp_path, monkeypatch):
+    monkeypatch.setattr(session_store, "OFFLOAD_DIR", str(tmp_path / "sessions"))
+    monkeypatch.setattr(session_store, "_sessions", {})
+    monkeypatch.setattr(session_store, "_start_sweeper", lambda: None)
+    store = session_store.get_session_store("busy")
+    store.append("User", "first question")
+    sweep_started = time.monotonic() + session_store.IDLE_OFFLOAD_SECONDS + 1
+    # The session is active again by the time the sweep reaches it
+    store.last_seen = sweep_started + 1
+    assert session_store.sweep(now=sweep_started)["offloaded"] == 0
+    store.append("User", "second question")
+    session_store.get_session_store("busy")
+    assert [text for _, text in store.history()] == ["first question", "second question"]
+
+
+def test_sweep_removes_stale_orphaned_transcripts(tmp_path, monkeypatch):
+    monkeypatch.setattr(session_store, "OFFLOAD_DIR", str(tmp_path))
+    monkeypatch.setattr(session_store, "_sessions", {})
+    stale, recent = tmp_path / "old.log.z", tmp_path / "new.log.z"
+    stale.write_bytes(b"x")
+    recent.write_bytes(b"x")
+    old = time.time() - session_store.IDLE_DROP_SECONDS - 60
+    os.utime(stale, (old, old))
+    assert session_store.sweep()["orphans_removed"] == 1
+    assert not stale.exists() and recent.exists()
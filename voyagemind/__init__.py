@@ -0,0 +1,13 @@
+"""Local helpers shared by the VoyageMind Streamlit pages."""
+import logging
+import os
+
+# Streamlit leaves other loggers at WARNING, which would drop the per-call
+# model metrics and session sweep lines, so the package gets its own handler
+logger = logging.getLogger(__name__)
+if not logger.handlers:
+    _handler = logging.StreamHandler()
+    _handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    logger.addHandler(_handler)
+    logger.setLevel(os.environ.get("VOYAGEMIND_LOG_LEVEL", "INFO").upper())
+    logger.propagate = False
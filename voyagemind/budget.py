@@ -0,0 +1,119 @@
+import csv
+import os
+import re
+
+import numpy as np
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+COST_INDEX_PATH = os.path.join(DATA_DIR, "cost_index.csv")
+
+CATEGORIES = ("accommodation", "transportation", "food", "activities", "miscellaneous")
+
+# Share of the total each spending tier typically puts into each category
+TIER_SHARES = {
+    "budget": np.array([0.30, 0.25, 0.25, 0.12, 0.08]),
+    "mid-range": np.array([0.38, 0.20, 0.22, 0.13, 0.07]),
+    "luxury": np.array([0.48, 0.17, 0.18, 0.12, 0.05]),
+}
+# Open-ended ranges such as "₹50k+" are planned at this multiple of the floor
+OPEN_RANGE_HEADROOM = 1.5
+UNITS = {"": 1, "k": 1_000, "l": 100_000, "lakh": 100_000, "cr": 10_000_000}
+
+_cost_index = None
+
+
+def load_cost_index():
+    """Load the bundled destination -> category multiplier table once"""
+    global _cost_index
+    if _cost_index is None:
+        with open(COST_INDEX_PATH, newline="", encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
+        names = [row["destination"].strip().lower() for row in rows]
+        table = np.array([[float(row[c]) for c in CATEGORIES] for row in rows])
+        _cost_index = (names, table)
+    return _cost_index
+
+
+def parse_budget_range(label):
+    """'Mid-range (₹15k-50k)' -> ('mid-range', 15000, 50000); open ranges give None as the ceiling"""
+    text = str(label or "").lower().replace(",", "")
+    tier = next((t for t in TIER_SHARES if t in text), "mid-range")
+    amounts = [
+        float(number) * UNITS.get(unit, 1)
+        for number, unit in re.findall(r"(\d+(?:\.\d+)?)\s*(lakh|cr|k|l)?", text)
+    ]
+    if not amounts:
+        return tier, None, None
+    low = amounts[0]
+    high = amounts[1] if len(amounts) > 1 else None
+    # "5k-15k" and "5-15k" both mean thousands for the lower bound
+    if high is not None and low < high / 1000 and "k" in text:
+        low *= 1_000
+    return tier, int(low), int(high) if high is not None else None
+
+
+def _destination_multipliers(destination):
+    names, table = load_cost_index()
+    text = str(destination or "").lower()
+    # Whole words only ("Baliganj" isn't Bali); the longest match wins so "new york" beats "york"
+    matches = [
+        i for i, name in enumerate(names)
+        if name != "default" and re.search(rf"\b{re.escape(name)}\b", text)
+    ]
+    row = max(matches, key=lambda i: len(names[i])) if matches else names.index("default")
+    return names[row], table[row]
+
+
+def _round_to_total(amounts, total):
+    """Round to whole rupees while keeping the sum exactly equal to total"""
+    floored = np.floor(amounts)
+    shortfall = int(round(total - floored.sum()))
+    if shortfall > 0:
+        floored[np.argsort(floored - amounts)[:shortfall]] += 1
+    return floored.astype(int)
+
+
+def plan_budget(budget_label, destination, days, travelers):
+    """Split the selected budget range across categories, per day and per traveler"""
+    tier, low, high = parse_budget_range(budget_label)
+    days = max(1, int(days)) if str(days).isdigit() else 1
+    travelers = max(1, int(travelers)) if str(travelers).isdigit() else 1
+    if low is None:
+        return None
+    total = (low + high) / 2 if high is not None else low * OPEN_RANGE_HEADROOM
+    total = int(round(total))
+
+    matched, multipliers = _destination_multipliers(destination)
+    weights = TIER_SHARES[tier] * multipliers
+    weights = weights / weights.sum()
+
+    totals = _round_to_total(weights * total, total)
+    day_total = int(round(total / days))
+    traveler_day_total = int(round(total / (days * travelers)))
+    # Round each column against its own total so every column adds up
+    per_day = _round_to_total(totals / days, day_total)
+    per_traveler_per_day = _round_to_total(totals / (days * travelers), traveler_day_total)
+
+    return {
+        "tier": tier,
+        "range": (low, high),
+        "total": total,
+        "days": days,
+        "travelers": travelers,
+        "cost_index": matched,
+        "rows": [
+            {
+                "category": category.capitalize(),
+                "total": int(totals[i]),
+                "per_day": int(per_day[i]),
+                "per_traveler_per_day": int(per_traveler_per_day[i]),
+            }
+            for i, category in enumerate(CATEGORIES)
+        ],
+        "per_day": day_total,
+        "per_traveler_per_day": traveler_day_total,
+    }
+
+
+def format_rupees(amount):
+    return f"Rs. {amount:,}"
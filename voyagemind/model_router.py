@@ -0,0 +1,193 @@
+import copy
+import logging
+import threading
+import time
+from collections import deque
+from collections.abc import Mapping
+
+import google.generativeai as genai
+import numpy as np
+
+from voyagemind.prompt_builder import PromptTooLarge, estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+# Task classes each call site declares
+QUICK_ANSWER = "quick_answer"
+CHAT = "chat"
+FULL_ITINERARY = "full_itinerary"
+DAY_EDIT = "day_edit"
+SUMMARY = "summary"
+
+DEFAULT_POLICY = {
+    "tiers": {
+        "fast": "gemini-1.5-flash-latest",
+        "quality": "gemini-1.5-pro-latest",
+    },
+    "tasks": {
+        QUICK_ANSWER: {"tier": "fast", "max_input_tokens": 1024, "max_output_tokens": 1024,
+                       "temperature": 0.4, "allow_downgrade": True},
+        CHAT: {"tier": "quality", "max_input_tokens": 2048, "max_output_tokens": 2048,
+               "temperature": 0.7, "allow_downgrade": True},
+        FULL_ITINERARY: {"tier": "quality", "max_input_tokens": 2048, "max_output_tokens": 8192,
+                         "temperature": 0.4, "allow_downgrade": False},
+        DAY_EDIT: {"tier": "fast", "max_input_tokens": 4096, "max_output_tokens": 2048,
+                   "temperature": 0.4, "allow_downgrade": True},
+        SUMMARY: {"tier": "fast", "max_input_tokens": 8192, "max_output_tokens": 512,
+                  "temperature": 0.3, "allow_downgrade": True},
+    },
+    # Downgrade to `downgrade_to` while a tier's recent p90 latency (seconds) is above its SLO
+    "auto_downgrade": True,
+    "downgrade_to": "fast",
+    "slo_seconds": {"quality": 20.0},
+    "latency_window": 20,
+    # Older samples are ignored so a downgraded tier gets retried once things calm down
+    "latency_max_age_seconds": 300,
+    # The pre-flight size check uses the chars/4 estimate; set this to ask the API for
+    # the exact count instead, at the cost of one extra round trip per call
+    "exact_token_count": False,
+}
+
+
+def _merge(base, overrides):
+    merged = copy.deepcopy(base)
+    for key, value in (overrides or {}).items():
+        if isinstance(value, Mapping) and isinstance(merged.get(key), Mapping):
+            merged[key] = _merge(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+def _usage(response):
+    usage = getattr(response, "usage_metadata", None)
+    return (
+        getattr(usage, "prompt_token_count", None),
+        getattr(usage, "candidates_token_count", None),
+    )
+
+
+class ModelRouter:
+    """Pick a Gemini tier and generation limits per task class and record how it went"""
+
+    def __init__(self, policy=None):
+        self.policy = _merge(DEFAULT_POLICY, policy)
+        self._models = {}
+        self._latencies = {}
+        self._totals = {}
+        self._lock = threading.Lock()
+
+    def route(self, task):
+        """Return (tier, task settings) for a task, applying the latency downgrade"""
+        settings = self.policy["tasks"].get(task) or self.policy["tasks"][CHAT]
+        tier = settings["tier"]
+        fallback = self.policy.get("downgrade_to")
+        slo = self.policy.get("slo_seconds", {}).get(tier)
+        if (self.policy.get("auto_downgrade") and settings.get("allow_downgrade")
+                and slo and fallback and fallback != tier and self.recent_latency(tier) > slo):
+            logger.warning("model tier %s over its %.1fs SLO, downgrading %s to %s", tier, slo, task, fallback)
+            tier = fallback
+        return tier, settings
+
+    def max_input_tokens(self, task):
+        return (self.policy["tasks"].get(task) or self.policy["tasks"][CHAT]).get("max_input_tokens")
+
+    def count_tokens(self, tier, prompt):
+        """Prompt size in tokens: exact from the API if the policy asks for it, else estimated"""
+        if self.policy.get("exact_token_count"):
+            return self._model(tier).count_tokens(prompt).total_tokens
+        return estimate_tokens(prompt)
+
+    def generate(self, task, prompt):
+        tier, settings = self.route(task)
+        model = self._model(tier)
+        # Pre-flight check so an oversized prompt never costs a generation call
+        counted = self.count_tokens(tier, prompt)
+        limit = self.max_input_tokens(task)
+        if limit and counted > limit:
+            raise PromptTooLarge(f"{task} prompt is ~{counted} tokens; the limit is {limit}")
+        generation_config = {
+            "max_output_tokens": settings.get("max_output_tokens"),
+            "temperature": settings.get("temperature"),
+        }
+        started = time.perf_counter()
+        try:
+            response = model.generate_content(
+                prompt,
+                generation_config={k: v for k, v in generation_config.items() if v is not None},
+            )
+        finally:
+            elapsed = time.perf_counter() - started
+            self._record(tier, elapsed)
+        prompt_tokens, output_tokens = _usage(response)
+        self._record_tokens(tier, prompt_tokens, output_tokens)
+        logger.info(
+            "model call task=%s tier=%s model=%s latency=%.2fs counted_prompt_tokens=%d "
+            "prompt_tokens=%s output_tokens=%s",
+            task, tier, self.policy["tiers"][tier], elapsed, counted, prompt_tokens, output_tokens,
+        )
+        return response
+
+    def recent_latency(self, tier, percentile=90):
+        cutoff = time.monotonic() - self.policy["latency_max_age_seconds"]
+        with self._lock:
+            window = [elapsed for at, elapsed in self._latencies.get(tier, ()) if at >= cutoff]
+        return float(np.percentile(window, percentile)) if window else 0.0
+
+    def stats(self):
+        """Per-tier call counts, latency and token totals for tuning the policy"""
+        with self._lock:
+            totals = copy.deepcopy(self._totals)
+        for tier, entry in totals.items():
+            entry["avg_latency"] = entry["latency"] / entry["calls"] if entry["calls"] else 0.0
+            entry["p90_latency"] = self.recent_latency(tier)
+        return totals
+
+    def _model(self, tier):
+        name = self.policy["tiers"][tier]
+        with self._lock:
+            if name not in self._models:
+                self._models[name] = genai.GenerativeModel(name)
+            return self._models[name]
+
+    def _record(self, tier, elapsed):
+        with self._lock:
+            window = self._latencies.setdefault(tier, deque(maxlen=self.policy["latency_window"]))
+            window.append((time.monotonic(), elapsed))
+            entry = self._totals.setdefault(
+                tier, {"calls": 0, "latency": 0.0, "prompt_tokens": 0, "output_tokens": 0}
+            )
+            entry["calls"] += 1
+            entry["latency"] += elapsed
+
+    def _record_tokens(self, tier, prompt_tokens, output_tokens):
+        with self._lock:
+            entry = self._totals[tier]
+            entry["prompt_tokens"] += prompt_tokens or 0
+            entry["output_tokens"] += output_tokens or 0
+
+
+_router = None
+_router_lock = threading.Lock()
+_warned_policy_change = False
+
+
+def get_router(policy=None):
+    """Process-wide router so latency history is shared by every session"""
+    global _router, _warned_policy_change
+    with _router_lock:
+        if _router is None:
+            _router = ModelRouter(policy)
+        elif (policy is not None and not _warned_policy_change
+              and _merge(DEFAULT_POLICY, policy) != _router.policy):
+            # Only the first policy takes effect; a changed [model_router] needs a restart
+            logger.warning("model router already built with a different policy; ignoring the new one until restart")
+            _warned_policy_change = True
+        return _router
+
+
+def router_stats():
+    """Stats of the process-wide router, without creating one with the default policy"""
+    with _router_lock:
+        router = _router
+    return router.stats() if router is not None else {}
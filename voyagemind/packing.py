@@ -0,0 +1,199 @@
+import csv
+import datetime
+import os
+import re
+
+import numpy as np
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+CLIMATE_PATH = os.path.join(DATA_DIR, "climate_normals.csv")
+
+# Monthly thresholds that switch weather rules on
+HOT_HIGH_C = 30
+COOL_LOW_C = 15
+COLD_LOW_C = 5
+FREEZING_LOW_C = 0
+WET_RAIN_MM = 150
+# Pack clothes for at most this many days and plan on laundry after that
+MAX_CLOTHING_DAYS = 7
+
+ESSENTIALS = [
+    "ID and booking confirmations (printed + phone copies)",
+    "Phone, charger and power bank",
+    "Cards and some cash",
+    "Prescription medicines and a basic first-aid kit",
+    "Toiletries and toothbrush",
+    "Reusable water bottle",
+]
+INTERNATIONAL = ["Passport and visa", "Universal power adapter", "Travel insurance details", "Forex card or foreign currency"]
+
+WEATHER_RULES = {
+    "hot": ["Sunscreen (SPF 50)", "Sunglasses", "Sun hat or cap", "Breathable cotton/linen clothes", "ORS or electrolyte sachets"],
+    "cool": ["Light jacket or fleece", "Full-length trousers"],
+    "cold": ["Thermal base layers", "Insulated jacket", "Warm socks", "Gloves and beanie"],
+    "freezing": ["Down jacket", "Waterproof insulated boots", "Lip balm and moisturiser", "Altitude sickness medicine (ask your doctor)"],
+    "wet": ["Compact umbrella", "Rain jacket or poncho", "Waterproof pouch for phone", "Quick-dry clothes", "Sandals or waterproof shoes"],
+}
+INTEREST_RULES = {
+    "History & Culture": ["Modest clothing for religious sites", "Scarf or shawl to cover shoulders"],
+    "Nature & Wildlife": ["Binoculars", "Insect repellent", "Neutral-coloured clothing"],
+    "Food & Drink": ["Antacids and digestive tablets", "Hand sanitiser"],
+    "Shopping": ["Foldable tote bag", "Spare luggage space or a packable duffel"],
+    "Adventure Sports": ["Sports shoes with grip", "Quick-dry activewear", "Blister plasters"],
+    "Wellness & Spa": ["Swimwear", "Comfortable loungewear"],
+    "Nightlife": ["One smart evening outfit", "Earplugs"],
+    "Photography": ["Camera with spare batteries", "Extra memory cards", "Lens cloth"],
+    "Local Experiences": ["Small-denomination cash", "Offline maps and a phrasebook app"],
+}
+SPECIAL_NEEDS_RULES = {
+    "Wheelchair Access": ["Wheelchair repair kit and spare parts", "Accessibility contact numbers for hotels"],
+    "Pet Friendly": ["Pet food and bowls", "Leash and waste bags", "Pet vaccination records"],
+    "Child Friendly": ["Snacks and wipes", "Children's medicines", "Games or books for transit"],
+    "Senior Friendly": ["Extra supply of regular medicines", "Medical summary and emergency contacts", "Walking aid or cushioned shoes"],
+    "Dietary Restrictions": ["Allergy/diet card in the local language", "Safe snacks for long stretches"],
+}
+TRIP_TYPE_RULES = {
+    "Business": ["Formal outfit", "Laptop and charger", "Business cards"],
+    "Adventure": ["Headlamp", "Daypack", "Multi-tool (in checked bag)"],
+    "Family": ["Shared medicine pouch", "Zip bags for wet or dirty items"],
+    "Solo": ["Padlock for lockers", "Copies of documents kept separately", "Emergency contact card"],
+    "Honeymoon": ["Dressy outfits for dinners", "Swimwear"],
+    "Leisure": ["Book or e-reader"],
+}
+PACE_RULES = {
+    "Fast-paced": ["Broken-in walking shoes", "Daypack", "Extra power bank"],
+    "Moderate": ["Comfortable walking shoes"],
+    "Relaxed": ["Book or e-reader", "Comfortable sandals"],
+}
+TRANSPORT_RULES = {
+    "Flight": ["Neck pillow", "Clear bag for liquids under 100 ml"],
+    "Train": ["Chain lock for luggage", "Snacks and water for the journey"],
+    "Road Trip": ["Car phone charger", "Motion sickness tablets", "Offline maps"],
+    "Cruise": ["Seasickness bands or tablets", "Outfit for formal night"],
+}
+
+_climate = None
+
+
+def load_climate():
+    """Load the bundled region x month normals into one (regions, 12, 3) array"""
+    global _climate
+    if _climate is None:
+        regions, keywords, rows = [], {}, []
+        with open(CLIMATE_PATH, newline="", encoding="utf-8") as f:
+            for index, row in enumerate(csv.DictReader(f)):
+                regions.append(row["region"])
+                for keyword in row["keywords"].split(";"):
+                    keywords[keyword.strip().lower()] = index
+                rows.append([[float(v) for v in row[column].split()] for column in ("high_c", "low_c", "rain_mm")])
+        # Stored as high/low/rain per month
+        normals = np.asarray(rows, dtype=np.float32).transpose(0, 2, 1)
+        _climate = (regions, keywords, normals)
+    return _climate
+
+
+def find_region(destination):
+    """Region index for a destination, matching the longest known place name as whole words"""
+    _, keywords, _ = load_climate()
+    text = str(destination or "").lower()
+    # Whole words only, so "Baliganj" isn't Bali and "Malegaon" isn't Male
+    matches = [keyword for keyword in keywords if re.search(rf"\b{re.escape(keyword)}\b", text)]
+    return keywords[max(matches, key=len)] if matches else None
+
+
+def trip_months(start_date, end_date):
+    """0-based month numbers the trip touches"""
+    if not isinstance(start_date, datetime.date) or not isinstance(end_date, datetime.date):
+        return [datetime.date.today().month - 1]
+    months, current = [], start_date.replace(day=1)
+    while current <= end_date and len(months) < 12:
+        months.append(current.month - 1)
+        current = (current + datetime.timedelta(days=32)).replace(day=1)
+    return months
+
+
+def weather_outlook(destination, start_date, end_date):
+    """Warmest high, coldest low and wettest month across the trip, or None if unknown"""
+    regions, _, normals = load_climate()
+    region = find_region(destination)
+    if region is None:
+        return None
+    months = normals[region, trip_months(start_date, end_date)]
+    return {
+        "region": regions[region],
+        "high_c": int(months[:, 0].max()),
+        "low_c": int(months[:, 1].min()),
+        "rain_mm": int(months[:, 2].max()),
+    }
+
+
+def _strip_emoji(label):
+    return "".join(char for char in str(label or "") if ord(char) < 128).strip()
+
+
+def _clothing(days):
+    packed = min(days, MAX_CLOTHING_DAYS)
+    items = [
+        f"{packed} tops / shirts",
+        f"{max(1, (packed + 1) // 2)} trousers / skirts / shorts",
+        f"{packed + 1} sets of underwear and socks",
+        "Sleepwear",
+    ]
+    if days > MAX_CLOTHING_DAYS:
+        items.append("Travel laundry kit (detergent sheets, clothesline)")
+    return items
+
+
+def build_packing_list(user_data):
+    """Rule-based packing list from the saved trip preferences; no network calls"""
+    start, end = user_data.get("start_date"), user_data.get("end_date")
+    days = (end - start).days + 1 if isinstance(start, datetime.date) and isinstance(end, datetime.date) else 3
+    destination = user_data.get("destination", "")
+    outlook = weather_outlook(destination, start, end)
+
+    sections = {"Essentials": list(ESSENTIALS), "Clothing": _clothing(days)}
+    domestic = outlook is not None and (outlook["region"].startswith("india_") or outlook["region"] == "andaman")
+    if not domestic:
+        # Unknown places may be abroad; better to be reminded of the passport
+        sections["Essentials"] += INTERNATIONAL
+
+    weather = []
+    if outlook:
+        if outlook["high_c"] >= HOT_HIGH_C:
+            weather += WEATHER_RULES["hot"]
+        if outlook["low_c"] <= FREEZING_LOW_C:
+            weather += WEATHER_RULES["cold"] + WEATHER_RULES["freezing"]
+        elif outlook["low_c"] <= COLD_LOW_C:
+            weather += WEATHER_RULES["cold"]
+        elif outlook["low_c"] <= COOL_LOW_C:
+            weather += WEATHER_RULES["cool"]
+        if outlook["rain_mm"] >= WET_RAIN_MM:
+            weather += WEATHER_RULES["wet"]
+    sections["Weather"] = weather
+
+    activities = []
+    for interest in user_data.get("interests") or []:
+        activities += INTEREST_RULES.get(interest, [])
+    activities += PACE_RULES.get(user_data.get("pace"), [])
+    activities += TRIP_TYPE_RULES.get(user_data.get("trip_type"), [])
+    sections["Activities"] = activities
+
+    sections["Special Requirements"] = [
+        item for need in user_data.get("special_needs") or [] for item in SPECIAL_NEEDS_RULES.get(need, [])
+    ]
+    sections["Journey"] = TRANSPORT_RULES.get(_strip_emoji(user_data.get("transport_mode")), [])
+
+    # Keep each item once, in the first section that asked for it
+    seen = set()
+    for name, items in sections.items():
+        unique = []
+        for item in items:
+            if item not in seen:
+                seen.add(item)
+                unique.append(item)
+        sections[name] = unique
+    return {
+        "days": days,
+        "weather": outlook,
+        "sections": {name: items for name, items in sections.items() if items},
+    }
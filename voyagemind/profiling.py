@@ -0,0 +1,187 @@
+import os
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+
+import streamlit as st
+
+from voyagemind.model_router import router_stats
+from voyagemind.session_store import session_metrics
+
+# Set to 1 to write folded stacks for every run (e.g. on a staging box). The results
+# panel is only shown to an admin passing ?profile=<token>, where the token matches
+# [admin] profile_token in secrets; that also turns profiling on for their runs
+PROFILE_ENV = "VOYAGEMIND_PROFILE"
+PROFILE_DIR = os.environ.get("VOYAGEMIND_PROFILE_DIR", os.path.join(tempfile.gettempdir(), "voyagemind-profiles"))
+SAMPLE_INTERVAL_SECONDS = 0.005
+TOP_FUNCTIONS = 15
+
+
+def _frame_label(frame):
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    """Samples one thread's call stack on a timer and aggregates identical stacks"""
+
+    def __init__(self, thread_id, script_frame=None, interval=SAMPLE_INTERVAL_SECONDS):
+        self.thread_id = thread_id
+        # The page's <module> frame; sampling stops by itself once it leaves the stack
+        self.script_frame = script_frame
+        self.interval = interval
+        self.stacks = Counter()
+        self.started = self.elapsed = None
+        self.saved = False
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self.started = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="voyagemind-profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+
+    @property
+    def samples(self):
+        return sum(self.stacks.values())
+
+    def _run(self):
+        try:
+            while not self._stop.wait(self.interval):
+                frame = sys._current_frames().get(self.thread_id)
+                stack = []
+                while frame is not None:
+                    stack.append(frame)
+                    # Streamlit's runner frames above the page script are the same every time
+                    if frame is self.script_frame:
+                        break
+                    frame = frame.f_back
+                if self.script_frame is not None and frame is None:
+                    # The run ended without finish_profiling (st.rerun, st.stop or an exception)
+                    break
+                if stack:
+                    self.stacks[tuple(_frame_label(f) for f in reversed(stack))] += 1
+        finally:
+            self.elapsed = time.perf_counter() - self.started
+            self.script_frame = None
+
+    def collapsed(self):
+        """Brendan Gregg's folded-stack format, readable by flamegraph.pl and speedscope"""
+        return "\n".join(f"{';'.join(stack)} {count}" for stack, count in self.stacks.most_common())
+
+    def top(self, n=TOP_FUNCTIONS):
+        """Hottest functions by self samples, with their inclusive samples"""
+        total, own = Counter(), Counter()
+        for stack, count in self.stacks.items():
+            own[stack[-1]] += count
+            for label in set(stack):
+                total[label] += count
+        ranked = sorted(total, key=lambda label: (own[label], total[label]), reverse=True)
+        return [(label, own[label], total[label]) for label in ranked[:n]]
+
+
+def admin_requested():
+    """True when ?profile=<token> matches [admin] profile_token in secrets"""
+    token = st.query_params.get("profile")
+    if not token:
+        return False
+    try:
+        expected = (st.secrets.get("admin") or {}).get("profile_token")
+    except FileNotFoundError:
+        return False
+    return bool(expected) and token == expected
+
+
+def start_profiling(page):
+    """Start sampling this script run if profiling is on; returns None otherwise"""
+    show = admin_requested()
+    if not show and os.environ.get(PROFILE_ENV) != "1":
+        return None
+    profiler = SamplingProfiler(threading.get_ident(), sys._getframe(1)).start()
+    profiler.page = page
+    profiler.show = show
+    return profiler
+
+
+def finish_profiling(profiler, before_rerun=False):
+    """Stop the profiler, save the folded stacks and show the hot functions to admins"""
+    if profiler is None or profiler.saved:
+        return None
+    # Stop first so the sampler never outlives a failed save or render
+    profiler.stop()
+    profiler.saved = True
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    path = os.path.join(PROFILE_DIR, f"{profiler.page}-{datetime.now():%Y%m%d-%H%M%S-%f}.folded")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(profiler.collapsed())
+    if not profiler.show:
+        return path
+
+    reports = st.session_state.setdefault("profile_reports", [])
+    reports.append({
+        "page": profiler.page,
+        "elapsed_ms": profiler.elapsed * 1000,
+        "samples": profiler.samples,
+        "top": profiler.top(),
+        "path": path,
+    })
+    if before_rerun:
+        # st.rerun() would discard the panel, so the next run shows this report
+        return path
+    st.session_state.profile_reports = []
+    for report in reports:
+        _render_report(report)
+    _render_server_stats()
+    return path
+
+
+def _render_report(report):
+    samples = max(1, report["samples"])
+    with st.expander(f"⏱️ Profile: {report['page']} ran {report['elapsed_ms']:.0f} ms ({report['samples']} samples)"):
+        if report["samples"]:
+            st.table([
+                {
+                    "Function": label,
+                    "Self %": f"{100 * own / samples:.1f}",
+                    "Total %": f"{100 * total / samples:.1f}",
+                }
+                for label, own, total in report["top"]
+            ])
+        st.caption(f"Folded stacks saved to {report['path']} (open with speedscope or flamegraph.pl)")
+
+
+def _render_server_stats():
+    with st.expander("📊 Server stats"):
+        tiers = router_stats()
+        if tiers:
+            st.markdown("**Model tiers** (since the server started)")
+            st.table([
+                {
+                    "Tier": tier,
+                    "Calls": entry["calls"],
+                    "Avg s": f"{entry['avg_latency']:.2f}",
+                    "p90 s": f"{entry['p90_latency']:.2f}",
+                    "Prompt tokens": entry["prompt_tokens"],
+                    "Output tokens": entry["output_tokens"],
+                }
+                for tier, entry in sorted(tiers.items())
+            ])
+        else:
+            st.caption("No model calls yet")
+
+        sessions = session_metrics()
+        if sessions:
+            st.caption(
+                f"Sessions: {len(sessions)} live, {sum(m['bytes'] for m in sessions) / 1024:.0f} KB held "
+                f"(largest {max(m['bytes'] for m in sessions) / 1024:.0f} KB), "
+                f"{sum(m['offloaded'] for m in sessions)} offloaded to disk"
+            )
@@ -0,0 +1,100 @@
+import math
+import re
+import textwrap
+from datetime import date
+
+UNSET = (None, "", "Not Set", "None", "Not specified")
+# Gemini averages roughly four characters per token for English prose; budgets here are
+# estimates, and the router can ask the API for exact counts (exact_token_count)
+CHARS_PER_TOKEN = 4
+TRIM_MARKER = " [...]"
+
+# Instructions come first and never vary, so repeated calls share a cacheable prefix
+CHAT_PREFIX = (
+    "You are VoyageMind, a travel concierge. Answer the traveler's question with specific "
+    "recommendations for their trip, in clear sections with emojis."
+)
+ITINERARY_PREFIX = (
+    "Create a day-by-day travel itinerary as JSON.\n"
+    "Rules:\n"
+    "1. Use ONLY ASCII characters (no currency symbols, emoji or special symbols); write Rs. for rupees\n"
+    "2. List each day's places with coordinates and opening hours; do NOT plan routes between them, "
+    "they are ordered locally\n"
+    "3. Return only valid JSON with this structure:\n"
+    '{"title":"string","days":[{"day":number,"date":"string","activities":"string",'
+    '"places":[{"name":"string","lat":number,"lon":number,"opens":"HH:MM","closes":"HH:MM","visit_minutes":number}],'
+    '"accommodation":"string","meals":"string","transportation":"string","highlights":"string","tips":"string"}]}'
+)
+
+
+class PromptTooLarge(ValueError):
+    """Raised when a prompt cannot be trimmed under its token budget"""
+
+
+def compact(text):
+    """Dedent, strip and collapse runs of whitespace while keeping line breaks"""
+    lines = (re.sub(r"[ \t]+", " ", line).strip() for line in textwrap.dedent(str(text)).splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+def estimate_tokens(text):
+    """Approximate token count (chars / 4); no API call"""
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def _is_set(value):
+    if isinstance(value, (list, tuple, set)):
+        return any(_is_set(v) for v in value)
+    return value not in UNSET
+
+
+def _format_date(value):
+    return value.strftime("%d %b %Y") if isinstance(value, date) else str(value)
+
+
+def trip_facts(trip):
+    """One '- Label: value' line per preference the traveler actually set"""
+    start, end = trip.get("start_date"), trip.get("end_date")
+    days = trip.get("days")
+    if isinstance(start, date) and isinstance(end, date):
+        days = (end - start).days + 1
+    facts = [
+        ("Destination", trip.get("destination")),
+        ("Dates", f"{_format_date(start)} to {_format_date(end)}" if _is_set(start) and _is_set(end) else None),
+        ("Duration", f"{days} days" if _is_set(days) else None),
+        ("Budget", trip.get("budget")),
+        ("Travelers", trip.get("travelers")),
+        ("Trip type", trip.get("trip_type")),
+        ("Pace", trip.get("pace")),
+        ("Interests", ", ".join(trip.get("interests") or trip.get("preferences") or [])),
+        ("Food", trip.get("food_preference")),
+        ("Transport", trip.get("transport_mode")),
+        ("Special needs", ", ".join(trip.get("special_needs") or [])),
+    ]
+    return "\n".join(f"- {label}: {compact(value)}" for label, value in facts if _is_set(value))
+
+
+def _assemble(prefix, trip, tail):
+    facts = trip_facts(trip)
+    return "\n".join(part for part in (prefix, f"Trip:\n{facts}" if facts else "", tail) if part)
+
+
+def fit_to_budget(prefix, trip, tail, max_tokens):
+    """Build the prompt, trimming only the variable tail if its estimated size runs over max_tokens"""
+    tail = compact(tail)
+    prompt = _assemble(prefix, trip, tail)
+    if not max_tokens or estimate_tokens(prompt) <= max_tokens:
+        return prompt
+    fixed = estimate_tokens(_assemble(prefix, trip, TRIM_MARKER))
+    room = (max_tokens - fixed) * CHARS_PER_TOKEN
+    if room <= 0:
+        raise PromptTooLarge(f"prompt needs ~{fixed} tokens before the question; budget is {max_tokens}")
+    return _assemble(prefix, trip, tail[:room].rstrip() + TRIM_MARKER)
+
+
+def build_chat_prompt(trip, question, max_tokens=None):
+    return fit_to_budget(CHAT_PREFIX, trip, f"Question: {question}", max_tokens)
+
+
+def build_itinerary_prompt(trip, days, max_tokens=None):
+    return fit_to_budget(ITINERARY_PREFIX, trip, f"Plan exactly {days} days.", max_tokens)
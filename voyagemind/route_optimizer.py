@@ -0,0 +1,211 @@
+import csv
+import os
+
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+GAZETTEER_PATH = os.path.join(DATA_DIR, "gazetteer.csv")
+
+# Straight-line distances are stretched to approximate real city streets
+ROAD_DETOUR_FACTOR = 1.3
+LOCAL_SPEED_KMH = 25.0
+DAY_START_MINUTES = 9 * 60
+DEFAULT_VISIT_MINUTES = 90
+MAX_TWO_OPT_PASSES = 50
+
+_gazetteer = None
+
+
+def load_gazetteer():
+    """Load the bundled place -> (lat, lon) table once per process"""
+    global _gazetteer
+    if _gazetteer is None:
+        table = {}
+        with open(GAZETTEER_PATH, newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                table[row["name"].strip().lower()] = (float(row["lat"]), float(row["lon"]))
+        _gazetteer = table
+    return _gazetteer
+
+
+def haversine_matrix(lats, lons):
+    """Pairwise great-circle distances in km for equally sized lat/lon arrays"""
+    lat = np.radians(np.asarray(lats, dtype=float))
+    lon = np.radians(np.asarray(lons, dtype=float))
+    dlat = lat[:, None] - lat[None, :]
+    dlon = lon[:, None] - lon[None, :]
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat)[:, None] * np.cos(lat)[None, :] * np.sin(dlon / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def _parse_clock(value):
+    """'09:30' -> 570 minutes after midnight, None if missing or malformed"""
+    try:
+        hours, minutes = (int(part) for part in str(value).strip().split(":")[:2])
+    except (ValueError, AttributeError):
+        return None
+    if not (0 <= hours < 24 and 0 <= minutes < 60):
+        return None
+    return hours * 60 + minutes
+
+
+def _format_clock(minutes):
+    minutes = int(round(minutes))
+    return f"{(minutes // 60) % 24:02d}:{minutes % 60:02d}"
+
+
+def normalize_places(places):
+    """Resolve the model's place list into located stops and unlocated names"""
+    gazetteer = load_gazetteer()
+    located, unlocated = [], []
+    for place in places or []:
+        if isinstance(place, str):
+            place = {"name": place}
+        if not isinstance(place, dict) or not str(place.get("name", "")).strip():
+            continue
+        name = str(place["name"]).strip()
+        try:
+            lat, lon = float(place["lat"]), float(place["lon"])
+            if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+                raise ValueError
+        except (KeyError, TypeError, ValueError):
+            coords = gazetteer.get(name.lower())
+            if coords is None:
+                unlocated.append(name)
+                continue
+            lat, lon = coords
+        try:
+            visit = max(0, int(place.get("visit_minutes") or DEFAULT_VISIT_MINUTES))
+        except (TypeError, ValueError):
+            visit = DEFAULT_VISIT_MINUTES
+        opens = _parse_clock(place.get("opens"))
+        closes = _parse_clock(place.get("closes"))
+        located.append({
+            "name": name,
+            "lat": lat,
+            "lon": lon,
+            "opens": opens if opens is not None else 0,
+            "closes": closes if closes is not None else 24 * 60,
+            "visit_minutes": visit,
+        })
+    return located, unlocated
+
+
+def _schedule(order, travel, opens, closes, visits, day_start):
+    """Walk the stops in order; return (minutes late, arrival times, end of day)"""
+    clock = day_start
+    late = 0.0
+    arrivals = []
+    previous = None
+    for stop in order:
+        if previous is not None:
+            clock += travel[previous, stop]
+        clock = max(clock, opens[stop])
+        arrivals.append(clock)
+        late += max(0.0, clock + visits[stop] - closes[stop])
+        clock += visits[stop]
+        previous = stop
+    return late, arrivals, clock
+
+
+def _nearest_neighbour(travel, opens, closes, visits, day_start):
+    """Greedy tour that prefers the earliest reachable stop still open"""
+    n = len(opens)
+    unvisited = np.ones(n, dtype=bool)
+    order = []
+    clock = day_start
+    current = None
+    for _ in range(n):
+        candidates = np.flatnonzero(unvisited)
+        leg = travel[current, candidates] if current is not None else np.zeros(len(candidates))
+        start = np.maximum(clock + leg, opens[candidates])
+        feasible = start + visits[candidates] <= closes[candidates]
+        pool = candidates[feasible] if feasible.any() else candidates
+        pool_start = start[feasible] if feasible.any() else start
+        # Among stops we can still make, take the one we can start soonest
+        nxt = int(pool[np.argmin(pool_start)])
+        clock = max(clock + (travel[current, nxt] if current is not None else 0.0), opens[nxt]) + visits[nxt]
+        unvisited[nxt] = False
+        order.append(nxt)
+        current = nxt
+    return order
+
+
+def _two_opt(order, dist, accept):
+    """Open-path 2-opt on distance; `accept` vetoes moves that break time windows"""
+    order = list(order)
+    n = len(order)
+    # Unlike a closed tour, a 3-stop path can still improve by reversing one end
+    if n < 3:
+        return order
+    for _ in range(MAX_TWO_OPT_PASSES):
+        improved = False
+        for i in range(n - 1):
+            route = np.asarray(order)
+            ks = np.arange(i + 1, n)
+            a, b = route[i - 1] if i > 0 else -1, route[i]
+            c = route[ks]
+            has_next = ks < n - 1
+            d = np.where(has_next, route[np.minimum(ks + 1, n - 1)], -1)
+            # Reversing order[i..k] swaps edges (a,b),(c,d) for (a,c),(b,d)
+            before = np.where(has_next, dist[c, d], 0.0)
+            after = np.where(has_next, dist[b, d], 0.0)
+            if a >= 0:
+                before = before + dist[a, b]
+                after = after + dist[a, c]
+            deltas = after - before
+            for j in np.flatnonzero(deltas < -1e-9)[np.argsort(deltas[deltas < -1e-9])]:
+                k = int(ks[j])
+                candidate = order[:i] + order[i:k + 1][::-1] + order[k + 1:]
+                if accept(candidate):
+                    order = candidate
+                    improved = True
+                    break
+        if not improved:
+            break
+    return order
+
+
+def optimize_day(places, day_start=DAY_START_MINUTES, speed_kmh=LOCAL_SPEED_KMH):
+    """Order one day's places to cut travel time while respecting opening hours"""
+    stops, unlocated = normalize_places(places)
+    result = {
+        "stops": [],
+        "arrivals": [],
+        "distance_km": 0.0,
+        "travel_minutes": 0,
+        "late_stops": [],
+        "unlocated": unlocated,
+    }
+    if not stops:
+        result["stops"] = list(unlocated)
+        return result
+
+    dist = haversine_matrix([s["lat"] for s in stops], [s["lon"] for s in stops]) * ROAD_DETOUR_FACTOR
+    travel = dist / speed_kmh * 60.0
+    opens = np.array([s["opens"] for s in stops], dtype=float)
+    closes = np.array([s["closes"] for s in stops], dtype=float)
+    visits = np.array([s["visit_minutes"] for s in stops], dtype=float)
+
+    order = _nearest_neighbour(travel, opens, closes, visits, day_start)
+    best_late = _schedule(order, travel, opens, closes, visits, day_start)[0]
+
+    def accept(candidate):
+        return _schedule(candidate, travel, opens, closes, visits, day_start)[0] <= best_late + 1e-9
+
+    order = _two_opt(order, dist, accept)
+    _, arrivals, _ = _schedule(order, travel, opens, closes, visits, day_start)
+
+    legs = dist[order[:-1], order[1:]] if len(order) > 1 else np.zeros(0)
+    result.update({
+        "stops": [stops[i]["name"] for i in order] + unlocated,
+        "arrivals": [_format_clock(t) for t in arrivals],
+        "distance_km": round(float(legs.sum()), 1),
+        "travel_minutes": int(round(float(legs.sum()) / speed_kmh * 60.0)),
+        "late_stops": [
+            stops[i]["name"] for i, t in zip(order, arrivals)
+            if t + visits[i] > closes[i] + 1e-9
+        ],
+    })
+    return result
@@ -0,0 +1,294 @@
+import hashlib
+import json
+import logging
+import os
+import stat
+import tempfile
+import threading
+import time
+import zlib
+from array import array
+
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+logger = logging.getLogger(__name__)
+
+MAX_SESSION_BYTES = int(os.environ.get("VOYAGEMIND_SESSION_MAX_BYTES", 256 * 1024))
+IDLE_OFFLOAD_SECONDS = int(os.environ.get("VOYAGEMIND_IDLE_OFFLOAD_SECONDS", 15 * 60))
+IDLE_DROP_SECONDS = int(os.environ.get("VOYAGEMIND_IDLE_DROP_SECONDS", 6 * 60 * 60))
+SWEEP_INTERVAL_SECONDS = 60
+# Below this size zlib's header overhead outweighs the savings
+COMPRESS_MIN_BYTES = 200
+OFFLOAD_DIR = os.path.join(tempfile.gettempdir(), "voyagemind-sessions")
+
+ROLES = ("User", "AI")
+
+
+class MessageLog:
+    """Chat transcript that stores each distinct message once, compressed when large"""
+
+    def __init__(self, max_bytes=MAX_SESSION_BYTES):
+        self.max_bytes = max_bytes
+        self._roles = array("B")
+        self._text_ids = array("I")
+        self._blobs = []
+        self._digests = []
+        self._refs = array("I")
+        self._index = {}
+        self._blob_bytes = 0
+
+    def __len__(self):
+        return len(self._text_ids)
+
+    def __iter__(self):
+        for role, text_id in zip(self._roles, self._text_ids):
+            yield ROLES[role], self._decode(self._blobs[text_id])
+
+    @property
+    def nbytes(self):
+        """Approximate bytes held: message payloads plus the index arrays and lists"""
+        overhead = (len(self._roles) * self._roles.itemsize
+                    + len(self._text_ids) * self._text_ids.itemsize
+                    + len(self._refs) * self._refs.itemsize
+                    + len(self._blobs) * 8
+                    + len(self._digests) * 16
+                    + len(self._index) * 16)
+        return self._blob_bytes + overhead
+
+    def append(self, role, text):
+        text = str(text)
+        raw = text.encode("utf-8")
+        digest = hashlib.blake2b(raw, digest_size=16).digest()
+        text_id = self._index.get(digest)
+        if text_id is None:
+            blob = b"\x01" + zlib.compress(raw) if len(raw) >= COMPRESS_MIN_BYTES else b"\x00" + raw
+            text_id = len(self._blobs)
+            self._blobs.append(blob)
+            self._digests.append(digest)
+            self._refs.append(0)
+            self._index[digest] = text_id
+            self._blob_bytes += len(blob)
+        self._refs[text_id] += 1
+        self._roles.append(ROLES.index(role) if role in ROLES else 1)
+        self._text_ids.append(text_id)
+        self._enforce_cap()
+
+    def to_bytes(self):
+        return zlib.compress(json.dumps(list(self)).encode("utf-8"))
+
+    @classmethod
+    def from_bytes(cls, data, max_bytes=MAX_SESSION_BYTES):
+        log = cls(max_bytes)
+        for role, text in json.loads(zlib.decompress(data).decode("utf-8")):
+            log.append(role, text)
+        return log
+
+    @staticmethod
+    def _decode(blob):
+        payload = zlib.decompress(blob[1:]) if blob[:1] == b"\x01" else blob[1:]
+        return payload.decode("utf-8")
+
+    def _enforce_cap(self):
+        # Drop the oldest messages first, but always keep the latest exchange
+        while self.nbytes > self.max_bytes and len(self._text_ids) > 2:
+            self._roles.pop(0)
+            text_id = self._text_ids.pop(0)
+            self._refs[text_id] -= 1
+            if self._refs[text_id] == 0:
+                self._blob_bytes -= len(self._blobs[text_id])
+                self._index.pop(self._digests[text_id], None)
+                self._blobs[text_id] = b"\x00"
+        # Reclaim the dropped slots once they outnumber the live texts
+        if len(self._blobs) > 2 * len(self._index):
+            self._compact()
+
+    def _compact(self):
+        """Renumber the live texts so dropped ones stop taking slots"""
+        live = sorted(set(self._text_ids))
+        remap = {old: new for new, old in enumerate(live)}
+        self._blobs = [self._blobs[old] for old in live]
+        self._digests = [self._digests[old] for old in live]
+        self._refs = array("I", (self._refs[old] for old in live))
+        self._text_ids = array("I", (remap[old] for old in self._text_ids))
+        self._index = {digest: text_id for text_id, digest in enumerate(self._digests)}
+
+
+def _private_dir(path):
+    """Create an owner-only directory, refusing one someone else planted in the temp dir"""
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    info = os.lstat(path)
+    if not stat.S_ISDIR(info.st_mode) or (hasattr(os, "getuid") and info.st_uid != os.getuid()):
+        raise PermissionError(f"{path} is not a directory owned by this user")
+    os.chmod(path, 0o700)
+
+
+class SessionStore:
+    """Heavy per-session state kept outside st.session_state so idle tabs can be swept"""
+
+    def __init__(self, session_id, max_bytes=MAX_SESSION_BYTES):
+        self.session_id = session_id
+        self.max_bytes = max_bytes
+        self.messages = MessageLog(max_bytes)
+        self.last_seen = time.monotonic()
+        self.offload_path = None
+        self._lock = threading.Lock()
+
+    @property
+    def nbytes(self):
+        return self.messages.nbytes
+
+    def touch(self):
+        with self._lock:
+            self.last_seen = time.monotonic()
+            if self.offload_path:
+                self._restore()
+
+    def append(self, role, text):
+        # Under the lock so the sweeper can't swap the log out mid-append
+        with self._lock:
+            self.messages.append(role, text)
+
+    def history(self):
+        """Snapshot of the transcript as (role, text) pairs"""
+        with self._lock:
+            return list(self.messages)
+
+    def offload(self, now=None, idle_seconds=IDLE_OFFLOAD_SECONDS):
+        """Move the transcript to disk if still idle; it is read back on the session's next run"""
+        with self._lock:
+            now = time.monotonic() if now is None else now
+            # Re-check here: the session may have been touched since the sweep picked it
+            if self.offload_path or not len(self.messages) or now - self.last_seen <= idle_seconds:
+                return 0
+            freed = self.messages.nbytes
+            _private_dir(OFFLOAD_DIR)
+            path = os.path.join(OFFLOAD_DIR, f"{hashlib.sha1(self.session_id.encode()).hexdigest()}.log.z")
+            # Transcripts are private: owner-only file, never following a planted symlink
+            flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_NOFOLLOW", 0)
+            with os.fdopen(os.open(path, flags, 0o600), "wb") as f:
+                f.write(self.messages.to_bytes())
+            self.messages = MessageLog(self.max_bytes)
+            self.offload_path = path
+            return freed
+
+    def discard(self):
+        with self._lock:
+            if self.offload_path and os.path.exists(self.offload_path):
+                os.remove(self.offload_path)
+            self.offload_path = None
+            self.messages = MessageLog(self.max_bytes)
+
+    def _restore(self):
+        try:
+            with open(self.offload_path, "rb") as f:
+                self.messages = MessageLog.from_bytes(f.read(), self.max_bytes)
+            os.remove(self.offload_path)
+        except (OSError, ValueError, zlib.error) as e:
+            logger.warning("Could not restore offloaded session %s: %s", self.session_id, e)
+        self.offload_path = None
+
+
+_sessions = {}
+_registry_lock = threading.Lock()
+_sweeper = None
+
+
+def get_session_store(session_id):
+    """Return (creating if needed) the store for a session and mark it active"""
+    with _registry_lock:
+        store = _sessions.get(session_id)
+        if store is None:
+            store = _sessions[session_id] = SessionStore(session_id)
+        # Mark it seen before releasing the registry so a concurrent sweep can't drop it
+        store.last_seen = time.monotonic()
+        _start_sweeper()
+    store.touch()
+    return store
+
+
+def current_session_store():
+    """Store for the Streamlit session running the current script"""
+    ctx = get_script_run_ctx()
+    return get_session_store(ctx.session_id if ctx else "local")
+
+
+def session_metrics():
+    """Bytes and message counts currently held per session"""
+    now = time.monotonic()
+    with _registry_lock:
+        stores = list(_sessions.values())
+    return [{
+        "session_id": store.session_id,
+        "bytes": store.nbytes,
+        "messages": len(store.messages),
+        "idle_seconds": int(now - store.last_seen),
+        "offloaded": bool(store.offload_path),
+    } for store in stores]
+
+
+def sweep(now=None):
+    """Offload sessions idle past the threshold and forget abandoned ones"""
+    now = time.monotonic() if now is None else now
+    offloaded = freed = 0
+    with _registry_lock:
+        stale = [sid for sid, s in _sessions.items() if now - s.last_seen > IDLE_DROP_SECONDS]
+        dropped = [_sessions.pop(sid) for sid in stale]
+        idle = [s for s in _sessions.values() if now - s.last_seen > IDLE_OFFLOAD_SECONDS]
+    for store in dropped:
+        store.discard()
+    for store in idle:
+        released = store.offload(now)
+        if released:
+            offloaded += 1
+            freed += released
+    orphans = _remove_orphaned_offloads()
+
+    metrics = session_metrics()
+    held = sum(m["bytes"] for m in metrics)
+    logger.info(
+        "session sweep: %d sessions, %d bytes held (max %d per session), offloaded %d (%d bytes), dropped %d, "
+        "removed %d orphaned transcripts",
+        len(metrics), held, max((m["bytes"] for m in metrics), default=0), offloaded, freed, len(dropped), orphans,
+    )
+    return {"sessions": len(metrics), "bytes_held": held, "offloaded": offloaded,
+            "bytes_freed": freed, "dropped": len(dropped), "orphans_removed": orphans}
+
+
+def _remove_orphaned_offloads(max_age_seconds=IDLE_DROP_SECONDS):
+    """Delete transcripts no live session points at, e.g. left by a previous server process"""
+    try:
+        names = os.listdir(OFFLOAD_DIR)
+    except FileNotFoundError:
+        return 0
+    with _registry_lock:
+        live = {store.offload_path for store in _sessions.values()}
+    # Age limit: another server process may share the temp dir and still own recent files
+    cutoff = time.time() - max_age_seconds
+    removed = 0
+    for name in names:
+        path = os.path.join(OFFLOAD_DIR, name)
+        if not name.endswith(".log.z") or path in live:
+            continue
+        try:
+            if os.lstat(path).st_mtime < cutoff:
+                os.remove(path)
+                removed += 1
+        except OSError:
+            pass
+    return removed
+
+
+def _sweep_forever():
+    while True:
+        time.sleep(SWEEP_INTERVAL_SECONDS)
+        try:
+            sweep()
+        except Exception:
+            logger.exception("session sweep failed")
+
+
+def _start_sweeper():
+    global _sweeper
+    if _sweeper is None:
+        _sweeper = threading.Thread(target=_sweep_forever, name="voyagemind-session-sweeper", daemon=True)
+        _sweeper.start()